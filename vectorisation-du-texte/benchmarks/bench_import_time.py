@@ -0,0 +1,105 @@
+"""
+Benchmark : temps de démarrage des points d'entrée de la pipeline
+
+Mesure, dans des processus Python neufs:
+- le temps d'import des modules légers (config, utils, run_pipeline)
+- le temps total des commandes de consultation (--list, --status)
+- les modules importés les plus coûteux (python -X importtime)
+
+Objectif: les commandes de consultation démarrent en moins de 200 ms et
+n'importent ni pandas, ni scikit-learn, ni spaCy, ni NLTK.
+
+Usage:
+    python benchmarks/bench_import_time.py [--repeat N]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+BUDGET_MS = 200
+HEAVY_MODULES = ["pandas", "sklearn", "spacy", "nltk", "scipy"]
+
+COMMANDS = {
+    "import config": [sys.executable, "-c", "import config"],
+    "import utils": [sys.executable, "-c", "import utils"],
+    "import run_pipeline": [sys.executable, "-c", "import run_pipeline"],
+    "run_pipeline --list": [sys.executable, "run_pipeline.py", "--list"],
+    "run_pipeline --status": [sys.executable, "run_pipeline.py", "--status"],
+}
+
+
+def time_command(cmd, repeat):
+    """
+    Retourne les durées (ms) de `repeat` exécutions de la commande
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=BASE_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def heavy_modules_loaded(module):
+    """
+    Liste les bibliothèques lourdes chargées par l'import d'un module
+    """
+    code = (f"import sys, {module}; "
+            f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR,
+                            check=True, capture_output=True, text=True)
+    return result.stdout.split()
+
+
+def top_imports(module, n=10):
+    """
+    Retourne les n imports les plus coûteux (temps cumulé, µs)
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=BASE_DIR, check=True, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = statistics.median(time_command([sys.executable, "-c", "pass"], args.repeat))
+    print(f"Interpréteur seul: {baseline:.1f} ms (médiane sur {args.repeat})\n")
+
+    print(f"{'Commande':<26}{'médiane':>10}{'min':>10}{'max':>10}  budget")
+    over_budget = False
+    for label, cmd in COMMANDS.items():
+        durations = time_command(cmd, args.repeat)
+        median = statistics.median(durations)
+        ok = median < BUDGET_MS
+        over_budget |= not ok
+        print(f"{label:<26}{median:>8.1f}ms{min(durations):>8.1f}ms"
+              f"{max(durations):>8.1f}ms  {'OK' if ok else 'DÉPASSÉ'}")
+
+    print()
+    for module in ["config", "utils", "run_pipeline"]:
+        heavy = heavy_modules_loaded(module)
+        print(f"Bibliothèques lourdes importées par {module}: {', '.join(heavy) or 'aucune'}")
+
+    print("\nImports les plus coûteux (run_pipeline):")
+    for cumulative_us, name in top_imports("run_pipeline"):
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Benchmark : chargement des données, chemin historique vs pyarrow
+
+Génère un export de --rows lignes (avis_annotés.csv répliqué) en CSV,
+Parquet et Arrow IPC, puis mesure pour chaque chemin le temps de
+chargement, le pic de RSS et la mémoire du DataFrame obtenu:
+- 'historique'        : pd.read_csv + concaténation / strip / filtre pandas
+                        (code de load_data avant le passage à pyarrow)
+- 'historique object' : idem avec dtype=object (comportement pandas < 3)
+- 'arrow <format>'    : scripts.load_data.load_data (projection, noyaux
+                        pyarrow.compute, colonnes string[pyarrow])
+
+Chaque mesure tourne dans un processus neuf (pic de RSS isolé).
+
+Usage:
+    python benchmarks/bench_load_data.py [--rows 2000000] [--dir /tmp/export]
+"""
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import INPUT_FILE
+
+
+def write_export(directory, n_rows):
+    """
+    Écrit l'export répliqué en CSV, Parquet et Arrow IPC; retourne {format: chemin}
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    base = pv.read_csv(INPUT_FILE)
+    table = pa.concat_tables([base] * (n_rows // base.num_rows + 1)).slice(0, n_rows)
+    paths = {
+        "csv": directory / "export.csv",
+        "parquet": directory / "export.parquet",
+        "arrow": directory / "export.arrow",
+    }
+    pv.write_csv(table, paths["csv"])
+    pq.write_table(table, paths["parquet"])
+    feather.write_feather(table, paths["arrow"], compression="uncompressed")
+    return paths
+
+
+def legacy_load(path, dtype=None):
+    import pandas as pd
+
+    df = pd.read_csv(path, dtype=dtype)
+    df['texte_complet'] = df['titre'].fillna('') + ' ' + df['corps'].fillna('')
+    df['texte_complet'] = df['texte_complet'].str.strip()
+    return df[df['texte_complet'].str.len() > 0].reset_index(drop=True)
+
+
+def measure(method, path):
+    """
+    Exécuté dans un processus neuf: (temps en s, pic de RSS au-dessus de la base, mémoire du df)
+    """
+    import pandas  # noqa: F401 (imports hors mesure)
+    import pyarrow.compute  # noqa: F401
+    from memory import current_rss, peak_rss, reset_peak_rss
+    from scripts.load_data import load_data
+
+    loaders = {
+        "historique": lambda: legacy_load(path),
+        "historique object": lambda: legacy_load(path, dtype=object),
+        "arrow": lambda: load_data(path),
+    }
+    base = current_rss()
+    reset_peak_rss()
+    start = time.perf_counter()
+    df = loaders[method]()
+    elapsed = time.perf_counter() - start
+    return elapsed, peak_rss() - base, df.memory_usage(deep=True).sum(), len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chargement: historique vs pyarrow")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--dir", help="Répertoire de l'export (défaut: temporaire)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(args.dir or tmp)
+        directory.mkdir(parents=True, exist_ok=True)
+        print(f"Génération de l'export ({args.rows} lignes)...")
+        paths = write_export(directory, args.rows)
+        for name, path in paths.items():
+            print(f"  {name:<8}{path.stat().st_size / 1e6:>8.0f} Mo")
+
+        runs = [("historique", "csv"), ("historique object", "csv"),
+                ("arrow", "csv"), ("arrow", "parquet"), ("arrow", "arrow")]
+        context = multiprocessing.get_context("spawn")
+        print(f"\n{'chemin':<20}{'format':<9}{'temps':>9}{'pic RSS':>11}{'DataFrame':>12}")
+        for method, file_format in runs:
+            with context.Pool(1) as pool:
+                elapsed, peak, df_bytes, n_rows = pool.apply(measure, (method, paths[file_format]))
+            print(f"{method:<20}{file_format:<9}{elapsed:>8.2f}s{peak / 1e6:>8.0f} Mo"
+                  f"{df_bytes / 1e6:>9.0f} Mo")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Benchmark : débit d'écriture / lecture et taille des artefacts par codec
+
+Compare pickle.dump classique (protocole par défaut) au format de
+serialization.py (protocole 5, buffers hors-bande) pour chaque codec
+disponible, sur deux types d'artefacts:
+- 'final'      : résultat FINAL (matrice creuse, vectoriseur, DataFrame)
+- 'checkpoint' : DataFrame prétraité seul (étapes 1 à 4)
+
+Usage:
+    python benchmarks/bench_serialization.py [--config NAME] [--scale 5] [--repeat 3]
+"""
+import argparse
+import os
+import pickle
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import serialization
+from config import ARTIFACT_CODECS
+from utils import load_final
+
+
+def scale_artifact(final, scale):
+    """
+    Réplique les lignes d'un résultat FINAL pour simuler un corpus plus gros
+    """
+    import pandas as pd
+    from scipy import sparse
+
+    if scale == 1:
+        return final
+    final = dict(final)
+    final['X_normalized'] = sparse.vstack([final['X_normalized']] * scale, format='csr')
+    final['df'] = pd.concat([final['df']] * scale, ignore_index=True)
+    final['target'] = final['df']['avis'].to_numpy()
+    return final
+
+
+def pickle_dump(obj, path):
+    with open(path, 'wb') as f:
+        pickle.dump(obj, f)
+
+
+def pickle_load(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def bench(obj, write, read, repeat):
+    """
+    Retourne (temps d'écriture médian, temps de lecture médian, taille en octets)
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "artifact.pkl"
+        write_times, read_times = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            write(obj, path)
+            write_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            read(path)
+            read_times.append(time.perf_counter() - start)
+        size = os.path.getsize(path)
+    return statistics.median(write_times), statistics.median(read_times), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit et taille par codec de sérialisation")
+    parser.add_argument("--config", default="config_L1_S1_LEM1_NG3",
+                        help="Résultat FINAL utilisé comme artefact de test")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="Facteur de réplication des lignes")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    final = scale_artifact(load_final(args.config), args.scale)
+    artifacts = {
+        "final": final,
+        "checkpoint": final['df'],
+    }
+    methods = {"pickle (défaut)": (pickle_dump, pickle_load)}
+    for codec in serialization.available_codecs():
+        methods[f"p5 {codec}"] = (
+            lambda obj, path, codec=codec: serialization.dump(obj, path, codec=codec),
+            serialization.load
+        )
+
+    for artifact, obj in artifacts.items():
+        raw_mb = len(pickle.dumps(obj, protocol=5)) / 1e6
+        configured = serialization.resolve_codec(ARTIFACT_CODECS.get(artifact, "none"))
+        print(f"\nArtefact '{artifact}' ({raw_mb:.1f} Mo sérialisé, codec configuré: {configured})")
+        print(f"{'méthode':<18}{'écriture':>11}{'lecture':>11}{'taille':>10}{'ratio':>8}")
+        for label, (write, read) in methods.items():
+            write_s, read_s, size = bench(obj, write, read, args.repeat)
+            print(f"{label:<18}{raw_mb / write_s:>7.0f}Mo/s{raw_mb / read_s:>7.0f}Mo/s"
+                  f"{size / 1e6:>8.1f}Mo{raw_mb * 1e6 / size:>7.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
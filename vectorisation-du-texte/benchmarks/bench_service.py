@@ -0,0 +1,173 @@
+"""
+Benchmark : test de charge du service de scoring (service.py)
+
+Ouvre --concurrency connexions keep-alive vers le service et envoie en
+boucle des avis tirés du CSV (POST /score) jusqu'à --requests requêtes.
+Rapporte les latences p50 / p99 / max, le débit et la taille moyenne des
+micro-lots (GET /health).
+
+Avec --spawn NAME, le service est lancé dans un sous-processus sur un
+socket Unix temporaire puis arrêté à la fin.
+
+Usage:
+    python benchmarks/bench_service.py --spawn config_L1_S1_LEM1_NG2 --concurrency 32
+    python benchmarks/bench_service.py --port 8765 --requests 5000
+    python benchmarks/bench_service.py --spawn NAME --max-batch-size 1   # sans micro-lots
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import SERVICE_HOST, SERVICE_PORT
+
+
+def load_records(limit=2000):
+    from scripts.load_data import load_data
+
+    return load_data()[['titre', 'corps']].fillna('').head(limit).to_dict('records')
+
+
+async def open_connection(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def request(reader, writer, method, path, payload=None):
+    """
+    Envoie une requête HTTP/1.1 keep-alive et retourne (statut, réponse JSON)
+    """
+    body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                  f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                  ).encode('latin-1') + body)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(args, records, counter, latencies, errors):
+    reader, writer = await open_connection(args)
+    try:
+        while True:
+            i = counter['next']
+            if i >= args.requests:
+                break
+            counter['next'] += 1
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, 'POST', '/score', records[i % len(records)])
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def wait_ready(args, timeout):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            reader, writer = await open_connection(args)
+            _, health = await request(reader, writer, 'GET', '/health')
+            writer.close()
+            return health
+        except (ConnectionError, FileNotFoundError, ValueError, IndexError):
+            if time.monotonic() > deadline:
+                raise SystemExit("Le service n'a pas démarré à temps")
+            await asyncio.sleep(0.2)
+
+
+async def run(args, records):
+    before = await wait_ready(args, args.startup_timeout)
+    print(f"Service: {before['config']} ({before['n_features']} features), "
+          f"micro-lots {before['max_batch_size']} avis / {before['max_latency_ms']:.0f} ms")
+
+    # Échauffement (hors mesures)
+    counter, latencies, errors = {'next': args.requests - args.warmup}, [], []
+    await asyncio.gather(*(client(args, records, counter, latencies, errors)
+                           for _ in range(min(args.concurrency, args.warmup))))
+
+    reader, writer = await open_connection(args)
+    _, before = await request(reader, writer, 'GET', '/health')
+
+    counter, latencies, errors = {'next': 0}, [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args, records, counter, latencies, errors)
+                           for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    _, after = await request(reader, writer, 'GET', '/health')
+    writer.close()
+
+    latencies_ms = np.array(latencies) * 1000
+    batches = after['batches'] - before['batches']
+    items = after['items'] - before['items']
+    print(f"Requêtes: {len(latencies)} ({len(errors)} erreurs), "
+          f"concurrence {args.concurrency}")
+    print(f"Latence p50: {np.percentile(latencies_ms, 50):.1f} ms, "
+          f"p99: {np.percentile(latencies_ms, 99):.1f} ms, "
+          f"moyenne: {statistics.fmean(latencies_ms):.1f} ms, max: {latencies_ms.max():.1f} ms")
+    print(f"Débit: {len(latencies) / elapsed:.0f} avis/s ({elapsed:.2f}s)")
+    print(f"Micro-lots: {batches}, taille moyenne {items / max(batches, 1):.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge du service de scoring")
+    parser.add_argument("--spawn", metavar="NAME",
+                        help="Lancer le service pour cette configuration (socket Unix temporaire)")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--unix", metavar="CHEMIN", help="Socket Unix du service")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--max-batch-size", type=int,
+                        help="Transmis au service lancé par --spawn")
+    parser.add_argument("--max-latency-ms", type=float,
+                        help="Transmis au service lancé par --spawn")
+    parser.add_argument("--startup-timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    records = load_records()
+    if not args.spawn:
+        asyncio.run(run(args, records))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        args.unix = str(Path(tmp) / "service.sock")
+        command = [sys.executable, str(Path(__file__).parent.parent / "service.py"),
+                   "--config", args.spawn, "--unix", args.unix]
+        if args.max_batch_size:
+            command += ["--max-batch-size", str(args.max_batch_size)]
+        if args.max_latency_ms is not None:
+            command += ["--max-latency-ms", str(args.max_latency_ms)]
+        process = subprocess.Popen(command, stderr=subprocess.DEVNULL)
+        try:
+            asyncio.run(run(args, records))
+        finally:
+            process.terminate()
+            process.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Benchmark : noyau TF-IDF fusionné vs chemin historique (configurations NG3)
+
+Chemin historique: TfidfVectorizer.fit_transform puis normalize() (copie),
+les deux matrices X_tfidf et X_normalized restant en mémoire.
+Chemin fusionné: CountVectorizer puis tfidf_inplace (tf sublinéaire, idf et
+normalisation en place sur X.data), une seule matrice.
+
+Les textes sont relus depuis les fichiers output/*_NG3_FINAL.pkl (colonne
+'texte_lemmatized'); --scale réplique le corpus pour simuler un gros export.
+Le pic mémoire est mesuré avec tracemalloc (allocations numpy / scipy);
+'conservé' compte les matrices gardées et 'vectoriseur' la taille du
+vectoriseur ajusté sérialisé (vocabulaire + idf, tel que stocké dans les
+checkpoints et résultats FINAL).
+
+Usage:
+    python benchmarks/bench_tfidf_kernel.py [--scale 10] [--repeat 3] [--config NAME ...]
+"""
+import argparse
+import pickle
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import OUTPUT_DIR, MIN_DOC_FREQ, MAX_DF_RATIO
+from scripts.tfidf import apply_tfidf
+from utils import load_final
+
+
+def legacy_path(df):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import normalize
+
+    vectorizer = TfidfVectorizer(ngram_range=(1, 3), min_df=MIN_DOC_FREQ, max_df=MAX_DF_RATIO,
+                                 lowercase=False, token_pattern=r'\b\w+\b', sublinear_tf=True)
+    X_tfidf = vectorizer.fit_transform(df['texte_lemmatized'])
+    X_normalized = normalize(X_tfidf, norm='l2', axis=1)
+    return {'X_tfidf': X_tfidf, 'X_normalized': X_normalized, 'vectorizer': vectorizer}
+
+
+def fused_path(df):
+    X_normalized, _, vectorizer = apply_tfidf(df, ngram_range=(1, 3), min_df=MIN_DOC_FREQ,
+                                              max_df=MAX_DF_RATIO)
+    return {'X_normalized': X_normalized, 'vectorizer': vectorizer}
+
+
+def measure(func, df, repeat):
+    """
+    Retourne (médiane du temps en s, pic mémoire en Mo, résultat)
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        durations.append(time.perf_counter() - start)
+        del result
+
+    tracemalloc.start()
+    result = func(df)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return float(np.median(durations)), peak / 1e6, result
+
+
+def retained_mb(result):
+    return sum(X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+               for key, X in result.items() if key != 'vectorizer') / 1e6
+
+
+def vectorizer_mb(result):
+    return len(pickle.dumps(result['vectorizer'], protocol=5)) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Noyau TF-IDF fusionné vs historique")
+    parser.add_argument("--config", action="append", metavar="NAME",
+                        help="Configuration NG3 à utiliser (défaut: toutes)")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="Facteur de réplication du corpus")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    names = args.config or sorted(path.name[:-len("_FINAL.pkl")]
+                                  for path in OUTPUT_DIR.glob("config_*_NG3_FINAL.pkl"))
+    if not names:
+        sys.exit(f"Aucun fichier *_NG3_FINAL.pkl dans {OUTPUT_DIR}")
+
+    import pandas as pd
+
+    print(f"{'Configuration':<26}{'chemin':<11}{'temps':>9}{'pic':>11}{'conservé':>12}"
+          f"{'vectoriseur':>14}")
+    for name in names:
+        df = load_final(name)['df'][['texte_lemmatized']]
+        df = pd.concat([df] * args.scale, ignore_index=True)
+
+        reference = None
+        for label, func in (("historique", legacy_path), ("fusionné", fused_path)):
+            duration, peak_mb, result = measure(func, df, args.repeat)
+            print(f"{name:<26}{label:<11}{duration:>8.3f}s{peak_mb:>9.1f}Mo"
+                  f"{retained_mb(result):>10.1f}Mo{vectorizer_mb(result):>12.2f}Mo")
+            if reference is None:
+                reference = result['X_normalized']
+            else:
+                diff = abs(reference - result['X_normalized']).max()
+                assert diff < 1e-10, f"Résultats différents ({diff})"
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
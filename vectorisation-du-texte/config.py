@@ -6,14 +6,11 @@ from pathlib import Path
 
 # Répertoires
 BASE_DIR = Path(__file__).parent
-DATA_DIR = BASE_DIR.parent.parent
+DATA_DIR = BASE_DIR.parent
 INPUT_FILE = DATA_DIR / "avis_annotés.csv"
 OUTPUT_DIR = BASE_DIR / "output"
 SCRIPTS_DIR = BASE_DIR / "scripts"
 
-# Créer le répertoire output s'il n'existe pas
-OUTPUT_DIR.mkdir(exist_ok=True)
-
 # Paramètres de traitement
 LOWERCASING_OPTIONS = [True, False]
 STOPWORDS_OPTIONS = [True, False]
@@ -28,8 +25,118 @@ TARGET_COLUMN = "avis"  # La colonne cible (sentiment)
 MIN_DOC_FREQ = 2  # Fréquence minimale d'apparition d'un mot
 MAX_DF_RATIO = 0.8  # Ratio max de documents contenant le mot
 
+# Valeurs par défaut des axes de la grille (cf. grid.py)
+PARAM_DEFAULTS = {
+    "lowercase": True,
+    "stopwords": True,
+    "lemmatization": True,
+    "ngram": 1,
+    "min_df": MIN_DOC_FREQ,
+    "max_df": MAX_DF_RATIO,
+    "sublinear_tf": True,
+    "analyzer": "word",
+    "token_pattern": r"\b\w+\b",
+    "char_ngram": (2, 5),
+    "norm": "l2",
+    "fields": "concat",
+}
+
+# Grille de paramètres: {axe: [valeurs]}. Les axes absents prennent leur
+# valeur par défaut. Peut être remplacée par un fichier TOML/YAML/JSON
+# (python run_pipeline.py --grid ma_grille.toml)
+PARAM_GRID = {
+    "lowercase": LOWERCASING_OPTIONS,
+    "stopwords": STOPWORDS_OPTIONS,
+    "lemmatization": LEMMATIZATION_OPTIONS,
+    "ngram": NGRAM_OPTIONS,
+}
+
+# Mode multi-champs (axe "fields" = "multi"): chaque colonne de TEXT_COLUMNS
+# a son propre vocabulaire / idf; les blocs sont pondérés puis concaténés
+FIELD_WEIGHTS = {"titre": 2.0, "corps": 1.0}  # Poids de chaque bloc
+FIELD_MAX_NGRAM = {"titre": 3, "corps": 2}  # Ordre maximal des n-grammes par champ
+MULTI_FIELD_N_JOBS = 2  # Champs ajustés en parallèle
+
+# Analyzer "char_wb": n-grammes de caractères hachés sur le texte en minuscules
+# (stopwords et lemmatisation ignorés, spaCy n'est pas chargé)
+HASH_N_FEATURES = 2 ** 20  # Nombre de colonnes de hachage avant filtrage min_df/max_df
+
+# Cache persistant des prétraitements par ligne (cf. row_cache.py)
+ROW_CACHE_ENABLED = True
+ROW_CACHE_FILE = OUTPUT_DIR / "row_cache.sqlite"
+ROW_CACHE_BATCH_SIZE = 5000  # Lignes lues / écrites par lot
+
+# Registre des exécutions (cf. registry.py): statut, durée, artefacts par étape
+REGISTRY_FILE = OUTPUT_DIR / "registry.sqlite"
+
+# Estimation mémoire (cf. memory.py, --max-memory): pic de RSS a priori de chaque
+# étape au-dessus du RSS de base, en octets par octet de CSV (mesuré sur
+# avis_annotés.csv), utilisé tant que le registre n'a pas de mesure comparable
+MEMORY_PRIOR = {
+    "load": 80,
+    "lowercase": 80,
+    "stopwords": 80,
+    "lemmatize": 90,
+    "vectorize": 100,
+    "normalize": 100,
+    "final": 100,
+}
+# Multiplicateur des étapes de vectorisation selon l'ordre des n-grammes
+MEMORY_PRIOR_NGRAM = {1: 1.0, 2: 1.25, 3: 1.5, "char_wb": 2.7}
+MEMORY_BASELINE = 200 * 2 ** 20  # RSS de base d'un processus (imports), sans mesure
+MEMORY_SAFETY_FACTOR = 1.2  # Marge appliquée aux estimations
+MEMORY_MAX_JOBS = os.cpu_count() or 1  # Configurations en parallèle au plus (--jobs)
+
+# Sérialisation (cf. serialization.py): codec par type d'artefact
+# "none", "zlib-<niveau>", "lzma-<niveau>", "lz4", "zstd-<niveau>" ou "fast"
+# (lz4 si installé, sinon none). zstd: sur demande ("zstd-3"), pour gagner de
+# l'espace disque au prix d'une écriture ~10x plus lente
+ARTIFACT_CODECS = {
+    "checkpoint": "none",  # Checkpoints intermédiaires: écrits à chaque étape, au débit maximal
+    "final": "none",  # Résultats FINAL: relus souvent, lecture la plus rapide
+}
+
+# Service de scoring (cf. service.py): requêtes concurrentes regroupées en micro-lots
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_MAX_BATCH_SIZE = 64  # Avis par micro-lot au maximum
+SERVICE_MAX_LATENCY_MS = 10  # Attente maximale avant de traiter un lot incomplet
+
+# Statistiques des termes par classe (cf. term_stats.py)
+TERM_STATS_PRIOR_SIZE = 1000  # Masse α0 du prior de Dirichlet informatif des log-odds
+TERM_STATS_TOP_K = 20  # Termes affichés par classe
+
+# Successive halving (--sampler halving)
+HALVING_MIN_ROWS = 200  # Budget de lignes du premier tour
+HALVING_ETA = 3  # Facteur de réduction entre deux tours
+
+# Réduction de dimension LSA (embeddings denses après normalisation)
+LSA_ENABLED = False  # Activer l'étape LSA optionnelle
+LSA_N_COMPONENTS = 100  # Dimension des embeddings
+LSA_ALGORITHM = "randomized"  # "randomized" (en mémoire) ou "incremental" (par blocs)
+LSA_BATCH_SIZE = 10000  # Lignes par bloc pour l'algorithme "incremental"
+
+# Clustering thématique des avis (k-means sphérique mini-batch, cf. scripts/clustering.py)
+CLUSTERING_ENABLED = False  # Activer l'étape de clustering après normalisation
+CLUSTERING_N_CLUSTERS = 20  # Nombre de clusters
+CLUSTERING_BATCH_SIZE = 4096  # Lignes par mini-batch
+CLUSTERING_N_EPOCHS = 5  # Passes sur la matrice
+CLUSTERING_N_JOBS = -1  # Threads pour l'affectation par blocs (-1: tous les cœurs)
+CLUSTERING_TOP_TERMS = 10  # Termes dominants conservés par cluster
+
 # Langue pour le traitement NLP
 LANGUAGE = "french"
 
 # Logging
 LOG_FILE = OUTPUT_DIR / "pipeline.log"
+
+
+def ensure_output_dir():
+    """
+    Crée le répertoire output s'il n'existe pas
+
+    Appelé par les points d'entrée qui écrivent sur disque (et non à
+    l'import) pour que les commandes de consultation restent sans effet de bord.
+    """
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    return OUTPUT_DIR
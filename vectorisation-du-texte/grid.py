@@ -0,0 +1,276 @@
+"""
+Grille de paramètres déclarative pour la pipeline de vectorisation
+
+Une grille est un dictionnaire {axe: [valeurs]} (défini dans config.PARAM_GRID
+ou chargé depuis un fichier TOML / YAML / JSON). Chaque axe est rattaché à
+l'étape de la pipeline qu'il influence: deux configurations qui ne diffèrent
+que par des axes d'une étape donnée partagent tous les résultats en amont
+de cette étape (ex: balayer min_df ne réajuste que le vectoriseur).
+
+Ce module n'importe aucune bibliothèque lourde.
+"""
+import hashlib
+import itertools
+import json
+import logging
+import random
+from pathlib import Path
+
+from config import PARAM_GRID, PARAM_DEFAULTS
+from utils import get_config_name
+
+logger = logging.getLogger(__name__)
+
+# Étapes de la pipeline, dans l'ordre d'exécution
+STAGES = ["load", "lowercase", "stopwords", "lemmatize", "vectorize"]
+
+# Étape influencée par chaque axe
+AXIS_STAGES = {
+    "fields": "load",
+    "lowercase": "lowercase",
+    "stopwords": "stopwords",
+    "lemmatization": "lemmatize",
+    "ngram": "vectorize",
+    "min_df": "vectorize",
+    "max_df": "vectorize",
+    "sublinear_tf": "vectorize",
+    "analyzer": "vectorize",
+    "token_pattern": "vectorize",
+    "char_ngram": "vectorize",
+    "norm": "vectorize",
+}
+
+# Axes sans effet quand analyzer == 'char_wb' (le texte en minuscules est
+# vectorisé directement): ramenés à une valeur unique pour dédoublonner
+CHAR_WB_IGNORED = {"stopwords": False, "lemmatization": False, "ngram": 1,
+                   "token_pattern": PARAM_DEFAULTS["token_pattern"], "fields": "concat"}
+
+# Abréviations utilisées dans le nom des configurations pour les axes
+# hors des quatre axes historiques (ajoutées seulement si != défaut)
+AXIS_ABBREVIATIONS = {
+    "min_df": "MINDF",
+    "max_df": "MAXDF",
+    "sublinear_tf": "SUB",
+    "analyzer": "AN",
+    "token_pattern": "TP",
+    "norm": "NORM",
+    "fields": "FIELDS",
+}
+
+
+def load_grid(path=None):
+    """
+    Charge une grille de paramètres
+
+    Parameters:
+    -----------
+    path : str ou Path, optionnel
+        Fichier .toml, .yaml/.yml ou .json. Si None, utilise config.PARAM_GRID
+
+    Returns:
+    --------
+    grid : dict
+        {axe: [valeurs]} complété avec les valeurs par défaut des axes absents
+    """
+    if path is None:
+        spec = PARAM_GRID
+    else:
+        path = Path(path)
+        suffix = path.suffix.lower()
+        if suffix == ".toml":
+            import tomllib
+            with open(path, 'rb') as f:
+                spec = tomllib.load(f)
+        elif suffix in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("PyYAML est requis pour lire une grille YAML (pip install pyyaml)")
+            with open(path, 'r') as f:
+                spec = yaml.safe_load(f)
+        elif suffix == ".json":
+            with open(path, 'r') as f:
+                spec = json.load(f)
+        else:
+            raise ValueError(f"Format de grille non supporté: {path}")
+        spec = spec.get("grid", spec)
+
+    unknown = set(spec) - set(AXIS_STAGES)
+    if unknown:
+        raise ValueError(f"Axe(s) inconnu(s) dans la grille: {', '.join(sorted(unknown))}")
+
+    grid = {}
+    for axis in AXIS_STAGES:
+        values = spec.get(axis, [PARAM_DEFAULTS[axis]])
+        if not isinstance(values, list):
+            values = [values]
+        if not values:
+            raise ValueError(f"L'axe '{axis}' n'a aucune valeur")
+        if axis == "char_ngram":
+            # (min, max) ou liste de (min, max); TOML/JSON donnent des listes
+            if not isinstance(values[0], (list, tuple)):
+                values = [values]
+            values = [tuple(value) for value in values]
+        grid[axis] = values
+    return grid
+
+
+def config_name(config):
+    """
+    Nom unique d'une configuration
+
+    Format historique config_L*_S*_LEM*_NG*, suivi d'un suffixe pour chaque
+    axe supplémentaire dont la valeur diffère du défaut (ex: _MINDF5).
+    Pour analyzer 'char_wb': config_L*_CHARWB{min}-{max}.
+    """
+    if config['analyzer'] == "char_wb":
+        low, high = config['char_ngram']
+        name = f"config_L{int(config['lowercase'])}_CHARWB{low}-{high}"
+    else:
+        name = get_config_name(config['lowercase'], config['stopwords'],
+                               config['lemmatization'], config['ngram'])
+    for axis, abbreviation in AXIS_ABBREVIATIONS.items():
+        value = config[axis]
+        if value == PARAM_DEFAULTS[axis] or (axis == "analyzer" and value == "char_wb"):
+            continue
+        if axis == "token_pattern":
+            value = hashlib.md5(value.encode()).hexdigest()[:6]
+        elif isinstance(value, bool):
+            value = int(value)
+        name += f"_{abbreviation}{value}"
+    return name
+
+
+def _make_config(values):
+    config = dict(values)
+    if config['analyzer'] == "char_wb":
+        config.update(CHAR_WB_IGNORED)
+    else:
+        config['char_ngram'] = PARAM_DEFAULTS['char_ngram']
+    config['name'] = config_name(config)
+    return config
+
+
+def expand_grid(grid):
+    """
+    Produit cartésien complet de la grille
+
+    Les axes sont parcourus dans l'ordre des étapes: les configurations
+    consécutives partagent donc le plus long préfixe d'étapes possible.
+    """
+    axes = sorted(grid, key=lambda axis: STAGES.index(AXIS_STAGES[axis]))
+    configs = {}
+    for combo in itertools.product(*(grid[axis] for axis in axes)):
+        config = _make_config(zip(axes, combo))
+        configs.setdefault(config['name'], config)
+    return list(configs.values())
+
+
+def sort_by_stages(configs):
+    """
+    Trie les configurations pour maximiser la réutilisation des étapes amont
+    """
+    return sorted(configs, key=lambda config: [repr(item) for item in stage_key(config, STAGES[-1])])
+
+
+def sample_configs(grid, method="full", n_samples=None, seed=42):
+    """
+    Sélectionne les configurations à traiter
+
+    Parameters:
+    -----------
+    grid : dict
+        Grille {axe: [valeurs]}
+    method : str
+        'full' (produit cartésien), 'random' (n_samples tirages sans remise)
+        ou 'halving' (toutes les candidates, à départager ensuite par
+        successive_halving)
+    n_samples : int, optionnel
+        Nombre de configurations pour 'random' / candidates pour 'halving'
+    seed : int
+        Graine aléatoire
+
+    Returns:
+    --------
+    configs : list of dict
+        Configurations triées par étapes partagées
+    """
+    configs = expand_grid(grid)
+    if method == "full":
+        return configs
+    if method not in ("random", "halving"):
+        raise ValueError(f"Méthode d'échantillonnage inconnue: {method}")
+    if n_samples is not None and n_samples < len(configs):
+        configs = random.Random(seed).sample(configs, n_samples)
+    return sort_by_stages(configs)
+
+
+def stage_key(config, stage):
+    """
+    Clé identifiant le résultat d'une étape pour une configuration
+
+    La clé contient les valeurs de tous les axes de cette étape et des
+    étapes en amont: deux configurations de même clé partagent le résultat.
+    """
+    upstream = STAGES[:STAGES.index(stage) + 1]
+    return tuple((axis, config[axis]) for axis in AXIS_STAGES
+                 if AXIS_STAGES[axis] in upstream)
+
+
+def successive_halving(configs, evaluate, n_rows, min_rows=200, eta=3):
+    """
+    Sélection par successive halving
+
+    Chaque tour évalue les candidates restantes sur un budget de lignes,
+    garde le meilleur 1/eta (au moins une) puis multiplie le budget par
+    eta. Le dernier tour (celui après lequel il ne resterait qu'une
+    survivante) utilise toutes les lignes: la survivante n'est jamais
+    réévaluée seule.
+
+    Parameters:
+    -----------
+    configs : list of dict
+        Configurations candidates
+    evaluate : callable
+        evaluate(config, n_rows) -> score (plus grand = meilleur)
+    n_rows : int
+        Nombre total de lignes disponibles
+    min_rows : int
+        Budget du premier tour
+    eta : int
+        Facteur de réduction
+
+    Returns:
+    --------
+    ranking : list of (score, config)
+        Meilleur 1/eta (au moins une) du dernier tour, de la meilleure à la
+        moins bonne (score None si une seule configuration était candidate)
+    """
+    candidates = sort_by_stages(configs)
+    if len(candidates) <= 1:
+        # Rien à départager
+        return [(None, config) for config in candidates]
+    # Tours jusqu'au dernier (moins de 2 × eta candidates)
+    n_rounds, remaining = 1, len(candidates)
+    while remaining >= 2 * eta:
+        remaining //= eta
+        n_rounds += 1
+    budget = max(min_rows, n_rows // eta ** (n_rounds - 1))
+
+    while True:
+        final = len(candidates) < 2 * eta
+        if final:
+            # Dernier tour prévu: toutes les lignes (le budget arrondi n'y arrive pas)
+            budget = n_rows
+        budget = min(budget, n_rows)
+        logger.info(f"Successive halving: {len(candidates)} candidates sur {budget} lignes")
+        scored = [(evaluate(config, budget), config) for config in candidates]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        for score, config in scored:
+            logger.info(f"  {score:.4f}  {config['name']}")
+
+        keep = max(1, len(scored) // eta)
+        if budget >= n_rows:
+            return scored[:keep]
+        candidates = sort_by_stages([config for _, config in scored[:keep]])
+        budget *= eta
@@ -0,0 +1,181 @@
+"""
+Vectorisation et scoring de nouveaux avis avec une configuration ajustée
+
+Charge une seule fois les artefacts d'un résultat FINAL (vectoriseur,
+paramètres de prétraitement) et applique à un lot d'avis exactement les
+étapes de la configuration: minuscules, stopwords, lemmatisation (un seul
+nlp.pipe pour tout le lot) puis transform creux du vectoriseur.
+
+Le score est donné par une régression logistique ajustée au chargement sur
+la matrice et la cible du résultat FINAL. Si des clusters ont été ajustés
+pour la configuration (scripts/clustering.py), chaque avis est aussi affecté
+au centroïde le plus proche.
+"""
+import logging
+import time
+
+from config import PARAM_DEFAULTS, TEXT_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+def record_text(record, field):
+    """
+    Texte d'un avis pour un champ ('texte' = titre + corps, comme load_data)
+
+    Un avis est un dict {'titre': ..., 'corps': ...} ou {'texte': ...}.
+    """
+    if field == 'texte':
+        if record.get('texte') is not None:
+            return str(record['texte']).strip()
+        return ' '.join(str(record.get(column) or '') for column in ('titre', 'corps')).strip()
+    if record.get(field) is None and field == 'corps':
+        # Avis fourni d'un bloc: tout le texte est traité comme corps
+        return str(record.get('texte') or '').strip()
+    return str(record.get(field) or '').strip()
+
+
+class FittedConfig:
+    """
+    Artefacts d'une configuration ajustée, prêts pour le transform en ligne
+
+    Parameters:
+    -----------
+    final : dict
+        Résultat FINAL (cf. utils.load_final)
+    fit_model : bool
+        Ajuster la régression logistique de scoring sur X_normalized / target
+    clusters : dict, optionnel
+        Clusters de la configuration (cf. scripts.clustering.load_clusters)
+    """
+
+    def __init__(self, final, fit_model=True, clusters=None):
+        # Les anciens résultats FINAL ne contiennent que les 4 axes historiques
+        self.config = {**PARAM_DEFAULTS, **final['config']}
+        self.name = self.config['name']
+        self.vectorizer = final['tfidf_vectorizer']
+        self.n_features = final['n_features']
+        self.char_wb = self.config['analyzer'] == 'char_wb'
+        self.multi_field = self.config['fields'] == 'multi'
+        self.fields = TEXT_COLUMNS if self.multi_field else ['texte']
+        self._stopwords = None
+        self.model = None
+        self.clusters = clusters
+
+        if fit_model:
+            from sklearn.linear_model import LogisticRegression
+
+            start = time.perf_counter()
+            self.model = LogisticRegression(max_iter=1000)
+            self.model.fit(final['X_normalized'], final['target'])
+            logger.info(f"Modèle de scoring ajusté en {time.perf_counter() - start:.2f}s "
+                        f"(classes: {list(self.model.classes_)})")
+
+    @classmethod
+    def load(cls, config_name, fit_model=True):
+        """
+        Charge le résultat FINAL de `config_name` (et ses clusters s'ils existent)
+        """
+        from scripts.clustering import load_clusters
+        from utils import get_output_file, load_final
+
+        start = time.perf_counter()
+        fitted = cls(load_final(config_name), fit_model=fit_model,
+                     clusters=load_clusters(get_output_file(config_name, "FINAL_clusters")))
+        logger.info(f"Configuration {config_name} chargée en {time.perf_counter() - start:.2f}s")
+        return fitted
+
+    def warmup(self):
+        """
+        Charge les ressources paresseuses (stopwords, spaCy) avant la première requête
+        """
+        self.score([{'titre': 'test', 'corps': 'chargement du modèle'}])
+
+    def preprocess(self, records):
+        """
+        Applique les étapes de prétraitement de la configuration à un lot d'avis
+
+        Returns:
+        --------
+        df : DataFrame
+            Colonnes '<champ>_lowercased' et '<champ>_lemmatized' (comme la pipeline)
+        """
+        import pandas as pd
+
+        columns = {}
+        for field in self.fields:
+            texts = [record_text(record, field) for record in records]
+            if self.config['lowercase']:
+                texts = [text.lower() for text in texts]
+            columns[f'{field}_lowercased'] = texts
+
+            if not self.char_wb and self.config['stopwords']:
+                from scripts.stopwords_removal import get_stopwords, remove_stopwords_texts
+                if self._stopwords is None:
+                    self._stopwords = get_stopwords()
+                texts = remove_stopwords_texts(texts, self._stopwords)
+            columns[f'{field}_lemmatized'] = texts
+
+        if not self.char_wb and self.config['lemmatization']:
+            from scripts.lemmatization import lemmatize_texts
+
+            # Un seul nlp.pipe pour tous les champs du lot
+            texts = [text for field in self.fields for text in columns[f'{field}_lemmatized']]
+            lemmas = lemmatize_texts(texts, log_progress=False)
+            for i, field in enumerate(self.fields):
+                columns[f'{field}_lemmatized'] = lemmas[i * len(records):(i + 1) * len(records)]
+
+        return pd.DataFrame(columns)
+
+    def transform(self, records):
+        """
+        Vectorise un lot d'avis (matrice creuse, lignes normalisées)
+        """
+        df = self.preprocess(records)
+        if self.char_wb:
+            return self.vectorizer.transform(df['texte_lowercased'])
+        if self.multi_field:
+            return self.vectorizer.transform(df)
+        return self.vectorizer.transform(df['texte_lemmatized'])
+
+    def assign(self, X):
+        """
+        Cluster de chaque ligne vectorisée et termes dominants de son centroïde
+        """
+        # Lots en ligne: affectation dans le thread appelant, sans pool
+        labels = self.clusters['model'].predict(X, n_jobs=1)
+        return [
+            {'cluster': int(label), 'cluster_terms': self.clusters['top_terms'][label]}
+            for label in labels
+        ]
+
+    def score(self, records):
+        """
+        Vectorise et score un lot d'avis
+
+        Returns:
+        --------
+        results : list of dict
+            Pour chaque avis: 'avis' (classe prédite), 'probas', 'n_terms', et
+            'cluster' / 'cluster_terms' si la configuration a des clusters
+        """
+        X = self.transform(records)
+        n_terms = X.getnnz(axis=1)
+        if self.model is None:
+            results = [{'n_terms': int(n)} for n in n_terms]
+        else:
+            probas = self.model.predict_proba(X)
+            classes = [str(label) for label in self.model.classes_]
+            results = [
+                {
+                    'avis': classes[row.argmax()],
+                    'probas': {label: round(float(p), 6) for label, p in zip(classes, row)},
+                    'n_terms': int(n)
+                }
+                for row, n in zip(probas, n_terms)
+            ]
+
+        if self.clusters is not None:
+            for result, cluster in zip(results, self.assign(X)):
+                result.update(cluster)
+        return results
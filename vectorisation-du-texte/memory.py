@@ -0,0 +1,239 @@
+"""
+Mesure et estimation de la mémoire des configurations
+
+Mesure: RSS courant et pic de RSS de l'arbre de processus (VmRSS / VmHWM
+de /proc/<pid>/status, processus courant et descendants: les workers
+joblib / loky qui ajustent les champs du mode multi-champs ont leur propre
+mémoire). Le pic est remis à zéro avant chaque étape (clear_refs), ce qui
+donne le pic propre à l'étape; la somme des pics des processus majore le
+pic de l'arbre. Sans /proc, on se rabat sur ru_maxrss (pic du processus
+courant depuis son début).
+
+Estimation: le pic d'une configuration est celui de sa plus grosse étape,
+au-dessus du RSS de base du processus. Pour chaque étape, par ordre de
+priorité:
+1. une exécution passée aux entrées identiques (même input_hash): son pic;
+2. des exécutions passées de même classe (étape, analyzer, n-grammes,
+   champs, étape activée ou non): leur pic par octet de CSV, rapporté à la
+   taille du CSV actuel;
+3. à défaut, les coefficients a priori de config.MEMORY_PRIOR.
+"""
+import logging
+import os
+import re
+import statistics
+
+from config import (
+    MEMORY_PRIOR, MEMORY_PRIOR_NGRAM, MEMORY_BASELINE, MEMORY_SAFETY_FACTOR
+)
+
+logger = logging.getLogger(__name__)
+
+_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+def parse_size(text):
+    """
+    '8G', '512M', '1.5G', '1000000' -> octets
+    """
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)i?[Bo]?\s*", str(text), re.IGNORECASE)
+    if match is None:
+        raise ValueError(f"Taille invalide: {text!r} (ex: 8G, 512M)")
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+def format_size(n_bytes):
+    if n_bytes is None:
+        return "?"
+    return f"{n_bytes / (1 << 20):.0f} Mo"
+
+
+def _proc_status(field, pid="self"):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            match = re.search(rf"^{field}:\s+(\d+) kB", f.read(), re.MULTILINE)
+        return int(match.group(1)) * 1024 if match else None
+    except OSError:
+        return None
+
+
+def child_pids():
+    """
+    PIDs des processus descendants du processus courant (workers joblib / loky)
+    """
+    try:
+        entries = [entry for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return []
+    children = {}
+    for entry in entries:
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Le nom (2e champ) peut contenir des espaces: le ppid suit la dernière ')'
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    descendants, stack = [], [os.getpid()]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            descendants.append(child)
+            stack.append(child)
+    return descendants
+
+
+def _tree_status(field):
+    own = _proc_status(field)
+    if own is None:
+        return None
+    return own + sum(_proc_status(field, pid) or 0 for pid in child_pids())
+
+
+def current_rss():
+    """
+    RSS actuel du processus et de ses descendants, en octets (None si indisponible)
+    """
+    return _tree_status("VmRSS")
+
+
+def peak_rss():
+    """
+    Pic de RSS du processus et de ses descendants depuis la dernière remise
+    à zéro, en octets
+    """
+    peak = _tree_status("VmHWM")
+    if peak is None:
+        try:
+            import resource
+        except ImportError:
+            return None
+        # ru_maxrss est en Ko sous Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return peak
+
+
+def reset_peak_rss():
+    """
+    Remet le pic de RSS au RSS courant, processus et descendants (Linux);
+    sans effet ailleurs
+    """
+    for pid in ["self"] + child_pids():
+        try:
+            with open(f"/proc/{pid}/clear_refs", "w") as f:
+                f.write("5")
+        except OSError:
+            pass
+
+
+def memory_class(config, stage):
+    """
+    Classe mémoire d'une étape: les axes qui changent son ordre de grandeur
+    """
+    if stage in ("load", "lowercase"):
+        return (stage, config['fields'])
+    if stage in ("stopwords", "lemmatize"):
+        # Étape désactivée = simple copie de colonne
+        enabled = config['stopwords' if stage == "stopwords" else 'lemmatization']
+        return (stage, enabled, config['fields'])
+    if config['analyzer'] == 'char_wb':
+        return (stage, 'char_wb', tuple(config['char_ngram']), config['fields'])
+    return (stage, config['analyzer'], config['ngram'], config['fields'])
+
+
+def prior_per_byte(config, stage):
+    """
+    Pic a priori d'une étape, en octets par octet de CSV (config.MEMORY_PRIOR)
+    """
+    ratio = MEMORY_PRIOR[stage]
+    if stage in ("stopwords", "lemmatize") and not memory_class(config, stage)[1]:
+        ratio = MEMORY_PRIOR["lowercase"]
+    if stage in ("vectorize", "normalize", "final"):
+        if config['analyzer'] == 'char_wb':
+            ratio *= MEMORY_PRIOR_NGRAM['char_wb']
+        else:
+            ratio *= ngram_factor(config['ngram'])
+    return ratio
+
+
+def ngram_factor(ngram):
+    """
+    Multiplicateur a priori d'un ordre de n-grammes (config.MEMORY_PRIOR_NGRAM);
+    au-delà des ordres connus, extrapolé linéairement depuis le plus grand
+    """
+    if ngram in MEMORY_PRIOR_NGRAM:
+        return MEMORY_PRIOR_NGRAM[ngram]
+    largest = max(order for order in MEMORY_PRIOR_NGRAM if isinstance(order, int))
+    return MEMORY_PRIOR_NGRAM[largest] * ngram / largest
+
+
+class MemoryEstimator:
+    """
+    Estime le pic de RSS d'une configuration à partir du registre
+
+    Parameters:
+    -----------
+    history : list of dict
+        Étapes mesurées (RunRegistry.memory_history)
+    input_bytes : int
+        Taille du CSV d'entrée actuel
+    data_digest : str
+        Hash du CSV actuel (cf. registry.file_digest)
+    """
+
+    def __init__(self, history, input_bytes, data_digest):
+        self.input_bytes = input_bytes
+        self.data_digest = data_digest
+        self.by_hash = {}
+        self.by_class = {}
+        baselines = []
+        for row in history:
+            delta = max(row['peak_rss'] - row['base_rss'], 0)
+            self.by_hash[(row['stage'], row['input_hash'])] = delta
+            if row['input_bytes']:
+                self.by_class.setdefault(memory_class(row['config'], row['stage']), []).append(
+                    delta / row['input_bytes'])
+            baselines.append(row['base_rss'])
+        self.baseline = statistics.median(baselines) if baselines else MEMORY_BASELINE
+
+    def stage_estimate(self, config, stage):
+        """
+        (pic estimé de l'étape au-dessus du RSS de base, source de l'estimation)
+        """
+        from grid import stage_key
+        from registry import input_hash
+
+        key_stage = "vectorize" if stage in ("normalize", "final") else stage
+        known = self.by_hash.get((stage, input_hash(self.data_digest, stage_key(config, key_stage))))
+        if known is not None:
+            return known, "mesure"
+        ratios = self.by_class.get(memory_class(config, stage))
+        if ratios:
+            return statistics.median(ratios) * self.input_bytes, "classe"
+        return prior_per_byte(config, stage) * self.input_bytes, "a priori"
+
+    def estimate(self, config):
+        """
+        Pic de RSS estimé d'une configuration (marge de sécurité incluse)
+
+        Returns:
+        --------
+        (octets, étape la plus coûteuse, source de l'estimation)
+        """
+        stages = [stage for stage in MEMORY_PRIOR
+                  if not (config['analyzer'] == 'char_wb' and stage in ("stopwords", "lemmatize"))]
+        peaks = {stage: self.stage_estimate(config, stage) for stage in stages}
+        stage = max(peaks, key=lambda name: peaks[name][0])
+        delta, source = peaks[stage]
+        return int(self.baseline + delta * MEMORY_SAFETY_FACTOR), stage, source
+
+
+def load_estimator(input_file):
+    """
+    Estimateur construit sur l'historique du registre et le CSV `input_file`
+    """
+    from registry import get_registry, file_digest
+
+    return MemoryEstimator(get_registry().memory_history(), os.path.getsize(input_file),
+                           file_digest(input_file))
@@ -0,0 +1,286 @@
+"""
+Registre transactionnel des exécutions (SQLite, mode WAL)
+
+Remplace status.json et l'analyse des noms de fichiers de output/: chaque
+configuration a une ligne dans `runs` (statut, durée, fichier FINAL) et une
+ligne par étape dans `stages` (statut, durée, artefact, taille, hash des
+entrées). Chaque écriture est une courte transaction: plusieurs processus
+peuvent mettre le registre à jour en même temps, et --status ne lit que la
+base, sans lister ni ouvrir les artefacts.
+
+Statuts d'une exécution: 'running', 'completed', 'failed'.
+Statuts d'une étape: 'completed', 'reused' (résultat partagé avec une autre
+configuration), 'skipped' (étape sans objet, ex. lemmatisation en char_wb).
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from functools import lru_cache
+
+from config import OUTPUT_DIR, PARAM_DEFAULTS, REGISTRY_FILE, ensure_output_dir
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    config TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    params TEXT,
+    started_at TEXT,
+    finished_at TEXT,
+    duration REAL,
+    output_file TEXT,
+    output_size INTEGER,
+    error TEXT,
+    base_rss INTEGER,
+    peak_rss INTEGER,
+    input_bytes INTEGER
+);
+CREATE TABLE IF NOT EXISTS stages (
+    config TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    finished_at TEXT,
+    duration REAL,
+    artifact TEXT,
+    size INTEGER,
+    input_hash TEXT,
+    peak_rss INTEGER,
+    PRIMARY KEY (config, stage)
+) WITHOUT ROWID;
+"""
+
+# Colonnes ajoutées après la création du schéma: (table, colonne, type)
+_MIGRATIONS = [
+    ("runs", "base_rss", "INTEGER"),
+    ("runs", "peak_rss", "INTEGER"),
+    ("runs", "input_bytes", "INTEGER"),
+    ("stages", "peak_rss", "INTEGER"),
+]
+
+
+def _now():
+    return datetime.now().isoformat()
+
+
+@lru_cache(maxsize=None)
+def _file_digest(path, size, mtime_ns):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_digest(path):
+    """
+    Hash du contenu d'un fichier (mémorisé tant que taille et date sont inchangées)
+    """
+    stat = os.stat(path)
+    return _file_digest(str(path), stat.st_size, stat.st_mtime_ns)
+
+
+def input_hash(data_digest, key):
+    """
+    Hash des entrées d'une étape: données sources + paramètres amont (grid.stage_key)
+    """
+    digest = hashlib.blake2b(data_digest.encode('ascii'), digest_size=16)
+    digest.update(repr(key).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class RunRegistry:
+    """
+    Accès au registre des exécutions
+
+    La connexion est ouverte à la première utilisation. Les lectures sur un
+    registre inexistant retournent un résultat vide sans créer la base.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or REGISTRY_FILE
+        self._conn = None
+
+    def _connect(self, create=True):
+        if self._conn is None:
+            if (not create and not os.path.exists(self.path)
+                    and not (OUTPUT_DIR / "status.json").exists()):
+                return None
+            ensure_output_dir()
+            self._conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._migrate()
+            self._import_status_json()
+        return self._conn
+
+    def __getstate__(self):
+        return {'path': self.path, '_conn': None}
+
+    def _write(self, sql, params):
+        """Une écriture = une transaction (BEGIN IMMEDIATE: pas de course entre processus)"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(sql, params)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _migrate(self):
+        """Ajoute aux registres existants les colonnes apparues depuis leur création"""
+        for table, column, sql_type in _MIGRATIONS:
+            columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                try:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type}")
+                except sqlite3.OperationalError:
+                    # Ajoutée entre-temps par un autre processus
+                    pass
+
+    def _import_status_json(self):
+        """Reprend une seule fois les configurations terminées de l'ancien status.json"""
+        status_file = OUTPUT_DIR / "status.json"
+        try:
+            with open(status_file, 'r') as f:
+                status = json.load(f)
+            status_file.rename(status_file.with_suffix(".json.imported"))
+        except FileNotFoundError:
+            # Absent, ou importé au même moment par un autre processus
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO runs (config, status, output_file) VALUES (?, 'completed', ?)",
+            [(name, entry.get("output_file")) for name, entry in status.items()
+             if entry.get("completed", False)]
+        )
+        self._conn.execute("COMMIT")
+        logger.info(f"status.json importé dans le registre ({len(status)} configurations)")
+
+    # Écritures -----------------------------------------------------------
+
+    def start_run(self, config, base_rss=None, input_bytes=None):
+        """
+        Marque une configuration en cours (ses étapes précédentes sont effacées)
+
+        base_rss : RSS du processus au démarrage, input_bytes : taille du CSV
+        (servent à l'estimation mémoire, cf. memory.py)
+        """
+        params = json.dumps({axis: value for axis, value in config.items() if axis != 'name'},
+                            default=str)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM stages WHERE config = ?", (config['name'],))
+        conn.execute(
+            "INSERT OR REPLACE INTO runs (config, status, params, started_at, base_rss, "
+            "input_bytes) VALUES (?, 'running', ?, ?, ?, ?)",
+            (config['name'], params, _now(), base_rss, input_bytes)
+        )
+        conn.execute("COMMIT")
+
+    def finish_run(self, config_name, duration, output_file):
+        """
+        Marque une configuration terminée (pic de RSS = pic de sa plus grosse étape)
+        """
+        self._write(
+            "UPDATE runs SET status = 'completed', finished_at = ?, duration = ?, "
+            "output_file = ?, output_size = ?, error = NULL, "
+            "peak_rss = (SELECT MAX(peak_rss) FROM stages WHERE config = runs.config) "
+            "WHERE config = ?",
+            (_now(), duration, str(output_file), os.path.getsize(output_file), config_name)
+        )
+
+    def fail_run(self, config_name, duration, error):
+        self._write(
+            "UPDATE runs SET status = 'failed', finished_at = ?, duration = ?, error = ?, "
+            "peak_rss = (SELECT MAX(peak_rss) FROM stages WHERE config = runs.config) "
+            "WHERE config = ?",
+            (_now(), duration, str(error), config_name)
+        )
+
+    def record_stage(self, config_name, stage, status, duration=None, artifact=None,
+                     input_hash=None, peak_rss=None):
+        """
+        Enregistre le résultat d'une étape (taille lue sur l'artefact s'il existe)
+        """
+        size = os.path.getsize(artifact) if artifact is not None else None
+        self._write(
+            "INSERT OR REPLACE INTO stages (config, stage, status, finished_at, duration, "
+            "artifact, size, input_hash, peak_rss) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (config_name, stage, status, _now(), duration,
+             None if artifact is None else str(artifact), size, input_hash, peak_rss)
+        )
+
+    # Lectures ------------------------------------------------------------
+
+    def completed(self):
+        """
+        Noms des configurations terminées
+        """
+        conn = self._connect(create=False)
+        if conn is None:
+            return set()
+        return {row[0] for row in conn.execute("SELECT config FROM runs WHERE status = 'completed'")}
+
+    def runs(self):
+        """
+        {configuration: ligne de `runs` (dict)}
+        """
+        conn = self._connect(create=False)
+        if conn is None:
+            return {}
+        return {row['config']: dict(row) for row in conn.execute("SELECT * FROM runs")}
+
+    def stages(self, config_name=None):
+        """
+        {configuration: [étapes (dict) dans l'ordre d'exécution]}
+        """
+        conn = self._connect(create=False)
+        if conn is None:
+            return {}
+        sql, params = "SELECT * FROM stages", ()
+        if config_name is not None:
+            sql, params = sql + " WHERE config = ?", (config_name,)
+        status = {}
+        for row in conn.execute(sql + " ORDER BY config, finished_at", params):
+            status.setdefault(row['config'], []).append(dict(row))
+        return status
+
+    def memory_history(self):
+        """
+        Étapes dont le pic de RSS a été mesuré, avec la configuration complète,
+        le RSS de base et la taille du CSV de leur exécution (cf. memory.py)
+        """
+        conn = self._connect(create=False)
+        if conn is None:
+            return []
+        rows = conn.execute(
+            "SELECT s.config, s.stage, s.input_hash, s.peak_rss, r.base_rss, r.input_bytes, "
+            "r.params FROM stages s JOIN runs r ON r.config = s.config "
+            "WHERE s.peak_rss IS NOT NULL AND r.base_rss IS NOT NULL"
+        )
+        history = []
+        for row in rows:
+            config = {**PARAM_DEFAULTS, **json.loads(row['params'] or '{}'), 'name': row['config']}
+            config['char_ngram'] = tuple(config['char_ngram'])
+            history.append({**dict(row), 'config': config})
+        return history
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+@lru_cache(maxsize=None)
+def get_registry():
+    """
+    Registre partagé du processus courant
+    """
+    return RunRegistry()
@@ -0,0 +1,137 @@
+"""
+Cache persistant des prétraitements, ligne par ligne
+
+Chaque sortie d'étape (stopwords, lemmatisation) est stockée dans SQLite sous
+la clé hash(étape, paramètres, texte). Quand le CSV est ré-exporté avec
+quelques lignes modifiées, seules les lignes absentes du cache sont recalculées.
+
+Lectures et écritures se font par lot (une requête / une transaction par lot
+de textes), jamais ligne par ligne.
+"""
+import hashlib
+import logging
+import sqlite3
+
+from config import ROW_CACHE_FILE, ROW_CACHE_BATCH_SIZE, ensure_output_dir
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal de paramètres liés par requête SQLite
+_SQL_CHUNK = 900
+
+
+class RowCache:
+    """
+    Table clé -> texte prétraité dans une base SQLite (mode WAL)
+
+    La connexion est ouverte à la première utilisation et n'est pas
+    sérialisée: l'objet peut être transmis à un autre processus.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or ROW_CACHE_FILE
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            ensure_output_dir()
+            self._conn = sqlite3.connect(self.path, timeout=60)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rows (key BLOB PRIMARY KEY, value TEXT NOT NULL) "
+                "WITHOUT ROWID"
+            )
+        return self._conn
+
+    def __getstate__(self):
+        return {'path': self.path, '_conn': None}
+
+    def get_many(self, keys):
+        """
+        Retourne {clé: valeur} pour les clés présentes dans le cache
+        """
+        conn = self._connect()
+        found = {}
+        for start in range(0, len(keys), _SQL_CHUNK):
+            chunk = keys[start:start + _SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(conn.execute(
+                f"SELECT key, value FROM rows WHERE key IN ({placeholders})", chunk
+            ))
+        return found
+
+    def put_many(self, items):
+        """
+        Enregistre les paires (clé, valeur) en une seule transaction
+        """
+        conn = self._connect()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO rows (key, value) VALUES (?, ?)", items)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def row_key(prefix, text):
+    """
+    Clé d'une ligne: hash de (étape + paramètres) et du texte
+    """
+    digest = hashlib.blake2b(prefix, digest_size=16)
+    digest.update(text.encode('utf-8'))
+    return digest.digest()
+
+
+def cached_apply(cache, stage, params, texts, compute, batch_size=ROW_CACHE_BATCH_SIZE):
+    """
+    Applique `compute` aux textes absents du cache uniquement
+
+    Parameters:
+    -----------
+    cache : RowCache ou None
+        Cache à utiliser (None: tout est recalculé)
+    stage : str
+        Nom de l'étape
+    params : str
+        Description des paramètres de l'étape (fait partie de la clé)
+    texts : list of str
+        Textes d'entrée
+    compute : callable
+        compute(list of str) -> list of str, appelé sur les lignes manquantes
+    batch_size : int
+        Nombre de lignes lues / écrites par lot
+
+    Returns:
+    --------
+    results : list of str
+        Sorties de l'étape, dans l'ordre des textes
+    """
+    if cache is None:
+        return list(compute(texts))
+
+    prefix = f"{stage}|{params}|".encode('utf-8')
+    results = []
+    n_hits = 0
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        keys = [row_key(prefix, text) for text in batch]
+        found = cache.get_many(list(set(keys)))
+
+        # Textes manquants, dédoublonnés
+        missing = {}
+        for key, text in zip(keys, batch):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            computed = compute(list(missing.values()))
+            new_items = list(zip(missing.keys(), computed))
+            cache.put_many(new_items)
+            found.update(new_items)
+
+        n_hits += len(batch) - len(missing)
+        results.extend(found[key] for key in keys)
+
+    logger.info(f"Cache de lignes '{stage}': {n_hits}/{len(texts)} lignes réutilisées")
+    return results
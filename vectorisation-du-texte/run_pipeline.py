@@ -10,116 +10,323 @@ Ce script lance chaque combinaison possible de prétraitement:
 
 Total: 2 × 2 × 2 × 3 = 24 combinaisons
 
+Ces axes (et d'autres: min_df, max_df, sublinear_tf, analyzer, token_pattern,
+norm) sont déclarés dans config.PARAM_GRID ou dans un fichier de grille
+(cf. grid.py). Les étapes partagées entre configurations ne sont calculées
+qu'une fois.
+
 Chaque résultat est sauvegardé dans output/ avec un nom unique.
+
+Usage:
+    python run_pipeline.py                 # Traite toutes les configurations
+    python run_pipeline.py --config NAME   # Traite une seule configuration
+    python run_pipeline.py --list          # Liste les configurations
+    python run_pipeline.py --status        # Affiche l'avancement
+    python run_pipeline.py --grid g.toml --sampler random --n-samples 10
+    python run_pipeline.py --max-memory 8G --jobs 4   # En parallèle sous budget mémoire
+
+Les bibliothèques lourdes (pandas, scikit-learn, spaCy, NLTK) ne sont
+importées que lorsqu'une étape en a besoin: --list et --status démarrent
+sans les charger.
 """
 
 import sys
 import os
+import argparse
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
 import logging
-import pickle
 import json
+import time
 from datetime import datetime
 
 # Ajouter le répertoire parent au path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import (
-    LOWERCASING_OPTIONS, STOPWORDS_OPTIONS, LEMMATIZATION_OPTIONS, 
-    NGRAM_OPTIONS, OUTPUT_DIR, TARGET_COLUMN
+    OUTPUT_DIR, INPUT_FILE, TARGET_COLUMN, HALVING_MIN_ROWS, HALVING_ETA, HASH_N_FEATURES,
+    ROW_CACHE_ENABLED, TEXT_COLUMNS, FIELD_WEIGHTS, FIELD_MAX_NGRAM, MULTI_FIELD_N_JOBS,
+    LSA_ENABLED, LSA_N_COMPONENTS, LSA_ALGORITHM, LSA_BATCH_SIZE, MEMORY_MAX_JOBS,
+    CLUSTERING_ENABLED, CLUSTERING_N_CLUSTERS
 )
+from grid import load_grid, sample_configs, stage_key, successive_halving
+from memory import current_rss, peak_rss, reset_peak_rss, parse_size, format_size
+from registry import get_registry, file_digest, input_hash
 from utils import (
-    get_config_name, save_checkpoint, load_checkpoint, 
-    get_completed_configs, log_config_complete, logger
+    save_checkpoint, load_checkpoint, save_final, get_output_file,
+    get_completed_configs, log_config_complete, logger, setup_logging
 )
 
 
-def generate_all_configs():
+def generate_all_configs(grid=None, method="full", n_samples=None, seed=42):
     """
-    Génère toutes les combinaisons de configurations possibles
+    Génère les configurations à traiter à partir de la grille de paramètres
+
+    Parameters:
+    -----------
+    grid : dict, optionnel
+        Grille {axe: [valeurs]} (par défaut config.PARAM_GRID, cf. grid.py)
+    method : str
+        'full', 'random' ou 'halving' (cf. grid.sample_configs)
+    n_samples : int, optionnel
+        Nombre de configurations tirées pour 'random' / 'halving'
+    seed : int
+        Graine aléatoire
     """
-    configs = []
-    for lowercase in LOWERCASING_OPTIONS:
-        for stopwords in STOPWORDS_OPTIONS:
-            for lemmatization in LEMMATIZATION_OPTIONS:
-                for ngram in NGRAM_OPTIONS:
-                    config_name = get_config_name(lowercase, stopwords, lemmatization, ngram)
-                    configs.append({
-                        'name': config_name,
-                        'lowercase': lowercase,
-                        'stopwords': stopwords,
-                        'lemmatization': lemmatization,
-                        'ngram': ngram
-                    })
-    return configs
+    if grid is None:
+        grid = load_grid()
+    return sample_configs(grid, method=method, n_samples=n_samples, seed=seed)
 
 
-def process_config(config):
+@lru_cache(maxsize=None)
+def load_stages():
     """
-    Traite une configuration complète
+    Importe une seule fois les modules des étapes (pandas, scikit-learn...)
+
+    Import local pour éviter de payer le coût des dépendances lourdes au
+    démarrage (--list, --status) et à chaque configuration.
     """
-    # Import local pour éviter les problèmes de dépendances au démarrage
     from scripts.load_data import load_data
     from scripts.lowercasing import apply_lowercasing
     from scripts.stopwords_removal import remove_stopwords
     from scripts.lemmatization import apply_lemmatization
     from scripts.tfidf import apply_tfidf
-    from scripts.normalize import normalize_vectors
+    from scripts.char_ngrams import apply_char_tfidf
+    from scripts.multi_field import apply_multi_field_tfidf
+    from scripts.normalize import check_normalized
     
+    return SimpleNamespace(
+        load_data=load_data,
+        apply_lowercasing=apply_lowercasing,
+        remove_stopwords=remove_stopwords,
+        apply_lemmatization=apply_lemmatization,
+        apply_tfidf=apply_tfidf,
+        apply_char_tfidf=apply_char_tfidf,
+        apply_multi_field_tfidf=apply_multi_field_tfidf,
+        check_normalized=check_normalized
+    )
+
+
+class StageCache:
+    """
+    Résultats d'étapes réutilisables entre configurations
+
+    Garde, pour chaque étape, le dernier résultat calculé et sa clé
+    (grid.stage_key). Les configurations étant triées par étapes partagées,
+    une entrée par étape suffit à réutiliser tout l'amont: balayer min_df
+    ne réajuste que le vectoriseur.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get_or_compute(self, stage, config, compute):
+        """
+        Retourne (résultat, réutilisé) pour l'étape `stage` de `config`
+        """
+        key = stage_key(config, stage)
+        entry = self._entries.get(stage)
+        if entry is not None and entry[0] == key:
+            return entry[1], True
+        
+        value = compute()
+        self._entries[stage] = (key, value)
+        return value, False
+
+
+def run_stages(config, cache, data=None, checkpoints=True, row_cache=None, registry=None):
+    """
+    Exécute les étapes 1 à 6 d'une configuration en réutilisant le cache
+
+    Parameters:
+    -----------
+    config : dict
+        Configuration (cf. grid.expand_grid)
+    cache : StageCache
+        Résultats des étapes déjà calculées
+    data : DataFrame, optionnel
+        Avis déjà chargés (successive halving: échantillon du tour) utilisés
+        à la place de l'étape de chargement; doivent contenir les colonnes
+        '<champ>_complet' pour le mode multi-champs
+    checkpoints : bool
+        Sauvegarder un checkpoint pour chaque étape calculée
+    row_cache : RowCache, optionnel
+        Cache persistant par ligne des étapes stopwords et lemmatisation
+    registry : RunRegistry, optionnel
+        Registre où enregistrer statut, durée et artefact de chaque étape
+
+    Returns:
+    --------
+    df, X_normalized, feature_names, tfidf_vectorizer
+    """
+    stages = load_stages()
     config_name = config['name']
-    logger.info("=" * 80)
-    logger.info(f"Traitement de la configuration: {config_name}")
-    logger.info(f"Paramètres: LC={config['lowercase']}, SW={config['stopwords']}, "
-                f"LEM={config['lemmatization']}, NG={config['ngram']}")
-    logger.info("=" * 80)
+    char_wb = config['analyzer'] == 'char_wb'
+    multi_field = config['fields'] == 'multi'
+    # Préfixes des colonnes prétraitées: texte fusionné, ou chaque champ séparément
+    text_fields = TEXT_COLUMNS if multi_field else ['texte']
     
-    try:
-        # Étape 1: Charger les données
-        logger.info("[1/7] Chargement des données...")
-        df = load_data()
-        save_checkpoint(df, config_name, "step01_loaded")
-        
-        # Étape 2: Lowercasing
-        logger.info("[2/7] Lowercasing...")
-        df = apply_lowercasing(df, apply_lowercasing=config['lowercase'])
-        save_checkpoint(df, config_name, "step02_lowercased")
-        
-        # Étape 3: Stopwords
-        logger.info("[3/7] Suppression des stopwords...")
-        df = remove_stopwords(df, apply_stopwords=config['stopwords'])
-        save_checkpoint(df, config_name, "step03_no_stopwords")
-        
-        # Étape 4: Lemmatisation
-        logger.info("[4/7] Lemmatisation...")
-        df = apply_lemmatization(df, apply_lemmatization=config['lemmatization'])
-        save_checkpoint(df, config_name, "step04_lemmatized")
-        
-        # Étape 5: Bag of Words / TF-IDF
-        logger.info("[5/7] Création de la matrice TF-IDF...")
-        
-        # Déterminer le range des n-grammes
-        ngram_range = (1, config['ngram'])
-        
-        X_tfidf, feature_names, tfidf_vectorizer = apply_tfidf(
-            df, 
-            ngram_range=ngram_range
-        )
+    def over_fields(func, df, **kwargs):
+        for field in text_fields:
+            df = func(df, field=field, **kwargs)
+        return df
+    
+    def record(stage, status, duration=None, artifact=None, key_stage=None, peak=None):
+        if registry is not None:
+            key = stage_key(config, key_stage or stage)
+            registry.record_stage(config_name, stage, status, duration, artifact,
+                                  input_hash(file_digest(INPUT_FILE), key), peak)
+    
+    def step(number, label, stage, compute, checkpoint_name):
+        logger.info(f"[{number}/7] {label}...")
+        if char_wb and stage in ("stopwords", "lemmatize"):
+            # Le texte en minuscules est vectorisé directement (pas de spaCy)
+            logger.info("Étape ignorée (analyzer char_wb)")
+            record(stage, "skipped")
+            return df
+        reset_peak_rss()
+        start = time.perf_counter()
+        result, reused = cache.get_or_compute(stage, config, compute)
+        duration = time.perf_counter() - start
+        artifact = None
+        if reused:
+            logger.info(f"Résultat réutilisé (étape '{stage}' partagée)")
+            record(stage, "reused", duration)
+            return result
+        if checkpoints:
+            artifact = save_checkpoint(result, config_name, checkpoint_name)
+        record(stage, "completed", duration, artifact, peak=peak_rss())
+        return result
+    
+    # Étape 1: Charger les données
+    def load():
+        if data is not None:
+            return data
+        return stages.load_data(fields=TEXT_COLUMNS if multi_field else None)
+    df = step(1, "Chargement des données", "load", load, "step01_loaded")
+    
+    # Étape 2: Lowercasing
+    df = step(2, "Lowercasing", "lowercase",
+              lambda: over_fields(stages.apply_lowercasing, df,
+                                  apply_lowercasing=config['lowercase']),
+              "step02_lowercased")
+    
+    # Étape 3: Stopwords
+    df = step(3, "Suppression des stopwords", "stopwords",
+              lambda: over_fields(stages.remove_stopwords, df,
+                                  apply_stopwords=config['stopwords'], cache=row_cache),
+              "step03_no_stopwords")
+    
+    # Étape 4: Lemmatisation
+    df = step(4, "Lemmatisation", "lemmatize",
+              lambda: over_fields(stages.apply_lemmatization, df,
+                                  apply_lemmatization=config['lemmatization'], cache=row_cache),
+              "step04_lemmatized")
+    
+    # Étape 5: Bag of Words / TF-IDF (pondération et normalisation fusionnées)
+    def vectorize():
+        if char_wb:
+            X_normalized, feature_names, tfidf_vectorizer = stages.apply_char_tfidf(
+                df,
+                ngram_range=config['char_ngram'],
+                min_df=config['min_df'],
+                max_df=config['max_df'],
+                sublinear_tf=config['sublinear_tf'],
+                n_features=HASH_N_FEATURES,
+                norm=config['norm']
+            )
+        elif multi_field:
+            X_normalized, feature_names, tfidf_vectorizer = stages.apply_multi_field_tfidf(
+                df,
+                fields=TEXT_COLUMNS,
+                ngram=config['ngram'],
+                max_ngram=FIELD_MAX_NGRAM,
+                weights=FIELD_WEIGHTS,
+                min_df=config['min_df'],
+                max_df=config['max_df'],
+                sublinear_tf=config['sublinear_tf'],
+                token_pattern=config['token_pattern'],
+                norm=config['norm'],
+                n_jobs=MULTI_FIELD_N_JOBS
+            )
+        else:
+            # Déterminer le range des n-grammes
+            ngram_range = (1, config['ngram'])
+            
+            X_normalized, feature_names, tfidf_vectorizer = stages.apply_tfidf(
+                df,
+                ngram_range=ngram_range,
+                min_df=config['min_df'],
+                max_df=config['max_df'],
+                sublinear_tf=config['sublinear_tf'],
+                analyzer=config['analyzer'],
+                token_pattern=config['token_pattern'],
+                norm=config['norm']
+            )
         
-        # Sauvegarder la matrice et les métadonnées
-        checkpoint_data = {
-            'X_tfidf': X_tfidf,
+        # Sauvegarder la matrice (une seule copie) et les métadonnées
+        return {
+            'X_normalized': X_normalized,
             'feature_names': feature_names,
             'tfidf_vectorizer': tfidf_vectorizer,
             'df': df
         }
-        save_checkpoint(checkpoint_data, config_name, "step05_tfidf")
-        
-        # Étape 6: Normalisation
-        logger.info("[6/7] Normalisation des vecteurs...")
-        X_normalized = normalize_vectors(X_tfidf, norm='l2')
-        
-        checkpoint_data['X_normalized'] = X_normalized
-        save_checkpoint(checkpoint_data, config_name, "step06_normalized")
+    checkpoint_data = step(5, "Création de la matrice TF-IDF", "vectorize",
+                           vectorize, "step05_tfidf")
+    
+    # Étape 6: Normalisation. Le noyau de vectorisation a déjà normalisé les
+    # lignes: contrôle sur un échantillon, pas de seconde passe sur la matrice
+    if config['norm']:
+        logger.info("[6/7] Contrôle de la normalisation des vecteurs...")
+        reset_peak_rss()
+        start = time.perf_counter()
+        stages.check_normalized(checkpoint_data['X_normalized'], norm=config['norm'])
+        record("normalize", "completed", time.perf_counter() - start, key_stage="vectorize",
+               peak=peak_rss())
+    else:
+        logger.info("[6/7] Normalisation désactivée (norm=None), étape ignorée")
+        record("normalize", "skipped", key_stage="vectorize")
+    
+    return (checkpoint_data['df'], checkpoint_data['X_normalized'],
+            checkpoint_data['feature_names'], checkpoint_data['tfidf_vectorizer'])
+
+
+def process_config(config, cache=None, row_cache=None, registry=None):
+    """
+    Traite une configuration complète
+
+    Parameters:
+    -----------
+    config : dict
+        Configuration à traiter
+    cache : StageCache, optionnel
+        Cache partagé entre configurations (réutilisation des étapes amont)
+    row_cache : RowCache, optionnel
+        Cache persistant par ligne des prétraitements
+    registry : RunRegistry, optionnel
+        Registre des exécutions (défaut: output/registry.sqlite)
+    """
+    if cache is None:
+        cache = StageCache()
+    if registry is None:
+        registry = get_registry()
+    
+    config_name = config['name']
+    logger.info("=" * 80)
+    logger.info(f"Traitement de la configuration: {config_name}")
+    logger.info("Paramètres: " + ", ".join(
+        f"{axis}={value!r}" for axis, value in config.items() if axis != 'name'))
+    logger.info("=" * 80)
+    
+    # RSS de base mesuré après les imports: seul le coût des étapes est estimé
+    load_stages()
+    registry.start_run(config, base_rss=current_rss(), input_bytes=os.path.getsize(INPUT_FILE))
+    start = time.perf_counter()
+    try:
+        df, X_normalized, feature_names, tfidf_vectorizer = run_stages(
+            config, cache, row_cache=row_cache, registry=registry
+        )
         
         # Étape 7: Sauvegarde du résultat final
         logger.info("[7/7] Sauvegarde du résultat final...")
@@ -129,36 +336,232 @@ def process_config(config):
             'feature_names': feature_names,
             'tfidf_vectorizer': tfidf_vectorizer,
             'df': df,
-            'target': df[TARGET_COLUMN].values,
+            'target': df[TARGET_COLUMN].to_numpy(),
             'config': config,
             'shape': X_normalized.shape,
             'n_features': len(feature_names),
             'timestamp': datetime.now().isoformat()
         }
         
-        final_file = OUTPUT_DIR / f"{config_name}_FINAL.pkl"
-        with open(final_file, 'wb') as f:
-            pickle.dump(final_output, f)
+        # Étape optionnelle: embeddings denses LSA
+        if LSA_ENABLED:
+            from scripts.lsa import apply_lsa
+            
+            logger.info("[LSA] Calcul des embeddings denses...")
+            lsa_file = OUTPUT_DIR / f"{config_name}_FINAL_lsa.npy"
+            # Embeddings écrits bloc par bloc en float32 dans le fichier (memory-map)
+            X_lsa, svd = apply_lsa(
+                X_normalized,
+                n_components=LSA_N_COMPONENTS,
+                algorithm=LSA_ALGORITHM,
+                batch_size=LSA_BATCH_SIZE,
+                filepath=lsa_file
+            )
+            del X_lsa
+            final_output['lsa_model'] = svd
+            final_output['lsa_file'] = str(lsa_file)
+        
+        # Étape optionnelle: clustering thématique (k-means sphérique mini-batch)
+        if CLUSTERING_ENABLED:
+            from scripts.clustering import apply_clustering, save_clusters
+            
+            logger.info("[Clustering] Regroupement des avis par thème...")
+            clusters = apply_clustering(X_normalized, feature_names,
+                                        n_clusters=CLUSTERING_N_CLUSTERS)
+            clusters_file = save_clusters(clusters, get_output_file(config_name, "FINAL_clusters"))
+            final_output['clusters_file'] = str(clusters_file)
+        
+        reset_peak_rss()
+        final_start = time.perf_counter()
+        final_file = save_final(final_output, config_name)
+        registry.record_stage(config_name, "final", "completed",
+                              time.perf_counter() - final_start, final_file,
+                              input_hash(file_digest(INPUT_FILE), stage_key(config, "vectorize")),
+                              peak_rss())
         
         logger.info(f"✓ Configuration complétée et sauvegardée: {final_file}")
         logger.info(f"  - Matrice: {final_output['shape']}")
         logger.info(f"  - Features: {final_output['n_features']}")
         
         # Marquer comme complétée
-        log_config_complete(config_name, final_file)
+        log_config_complete(config_name, final_file, time.perf_counter() - start)
         
         return True
         
     except Exception as e:
         logger.error(f"✗ Erreur lors du traitement de {config_name}: {str(e)}")
         logger.exception(e)
+        registry.fail_run(config_name, time.perf_counter() - start, e)
         return False
 
 
-def print_summary(all_configs, completed):
+def stratified_order(target, seed=42):
+    """
+    Permutation aléatoire des lignes dont chaque préfixe respecte les
+    proportions des classes de `target` (échantillons stratifiés emboîtés)
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    target = np.asarray(target)
+    keys = np.empty(len(target))
+    for label in np.unique(target):
+        rows = np.flatnonzero(target == label)
+        rng.shuffle(rows)
+        # Rang relatif dans la classe: les classes s'entrelacent proportionnellement
+        keys[rows] = (np.arange(len(rows)) + rng.random()) / len(rows)
+    return np.argsort(keys, kind='stable')
+
+
+def select_by_halving(configs, min_rows=HALVING_MIN_ROWS, eta=HALVING_ETA, row_cache=None,
+                      seed=42):
+    """
+    Départage les configurations candidates par successive halving
+
+    Chaque candidate est évaluée par validation croisée (F1 macro d'une
+    régression logistique) sur un échantillon d'avis de taille croissante,
+    tiré une fois (graine `seed`) et stratifié sur la cible: chaque tour
+    reprend les lignes du précédent et en ajoute. Les données sont chargées
+    une seule fois pour tous les tours.
+
+    Returns:
+    --------
+    selected : list of dict
+        Configurations retenues au dernier tour
+    """
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import cross_val_score
+    
+    # Colonnes de tous les modes (texte fusionné et champs séparés)
+    data = load_stages().load_data(fields=TEXT_COLUMNS)
+    order = stratified_order(data[TARGET_COLUMN].to_numpy(), seed)
+    state = {'n_rows': None, 'cache': None, 'sample': None}
+    
+    def evaluate(config, n_rows):
+        # Un échantillon et un cache par budget: les étapes amont restent partagées dans un tour
+        if state['n_rows'] != n_rows:
+            state['n_rows'], state['cache'] = n_rows, StageCache()
+            state['sample'] = data.iloc[order[:n_rows]].reset_index(drop=True)
+        df, X, _, _ = run_stages(config, state['cache'], data=state['sample'],
+                                 checkpoints=False, row_cache=row_cache)
+        model = LogisticRegression(max_iter=1000)
+        return cross_val_score(model, X, df[TARGET_COLUMN].to_numpy(),
+                               cv=3, scoring='f1_macro').mean()
+    
+    n_rows = len(data)
+    ranking = successive_halving(configs, evaluate, n_rows, min_rows=min_rows, eta=eta)
+    return [config for _, config in ranking]
+
+
+def _process_config_task(config, use_row_cache):
+    """
+    Traite une configuration dans un processus de travail (--max-memory)
+    """
+    setup_logging()
+    row_cache = None
+    if use_row_cache:
+        from row_cache import RowCache
+        row_cache = RowCache()
+    try:
+        return process_config(config, StageCache(), row_cache)
+    finally:
+        # Les processus loky de joblib (multi-champs) empêcheraient sinon ce
+        # processus de se terminer avant leur délai d'inactivité (5 min)
+        if 'joblib' in sys.modules:
+            from joblib.externals.loky import get_reusable_executor
+            get_reusable_executor().shutdown(wait=True)
+
+
+def run_with_memory_budget(configs, max_memory, n_jobs=MEMORY_MAX_JOBS, use_row_cache=True):
+    """
+    Traite les configurations en parallèle sous un budget mémoire
+
+    Le pic de chaque configuration est estimé (memory.MemoryEstimator: mesures
+    du registre, sinon statistiques du corpus). Les configurations sont admises
+    par pic estimé décroissant (les NG3 d'abord: les plus longues ne finissent
+    pas seules en fin de grille) tant que la somme des pics estimés en cours
+    reste sous `max_memory`; une plus petite peut passer devant une grosse qui
+    ne tient pas encore. Une configuration dont l'estimation dépasse le budget
+    à elle seule est lancée quand plus rien d'autre ne tourne.
+
+    Chaque configuration tourne dans un processus neuf (mémoire rendue au
+    système à la fin, pic mesuré sans les résultats des configurations
+    précédentes); les étapes amont ne sont donc pas partagées entre
+    configurations, seul le cache de lignes l'est.
+
+    Returns:
+    --------
+    successful, failed : int
+    """
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+    from memory import load_estimator
+    
+    estimator = load_estimator(INPUT_FILE)
+    estimates = {}
+    for config in configs:
+        estimates[config['name']], stage, source = estimator.estimate(config)
+        logger.info(f"Mémoire estimée {config['name']}: {format_size(estimates[config['name']])} "
+                    f"(étape '{stage}', {source})")
+    
+    pending = sorted(configs, key=lambda config: estimates[config['name']], reverse=True)
+    logger.info(f"Budget mémoire: {format_size(max_memory)}, {n_jobs} processus au plus, "
+                f"{len(pending)} configurations")
+    
+    running = {}
+    used = 0
+    successful = failed = 0
+    registry = get_registry()
+    # Un processus par configuration (max_tasks_per_child=1)
+    with ProcessPoolExecutor(max_workers=n_jobs, max_tasks_per_child=1) as pool:
+        while pending or running:
+            for config in list(pending):
+                if len(running) >= n_jobs:
+                    break
+                estimate = estimates[config['name']]
+                if used + estimate > max_memory and running:
+                    continue
+                if estimate > max_memory:
+                    logger.warning(f"{config['name']}: estimation {format_size(estimate)} "
+                                   f"au-delà du budget, lancée seule")
+                pending.remove(config)
+                used += estimate
+                running[pool.submit(_process_config_task, config, use_row_cache)] = config
+                logger.info(f"Lancement {config['name']} (mémoire réservée "
+                            f"{format_size(used)} / {format_size(max_memory)})")
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            runs = registry.runs()
+            for future in done:
+                config = running.pop(future)
+                used -= estimates[config['name']]
+                try:
+                    ok = future.result()
+                except Exception as e:
+                    logger.error(f"✗ {config['name']}: processus interrompu ({e})")
+                    ok = False
+                successful += ok
+                failed += not ok
+                
+                run = runs.get(config['name'], {})
+                logger.info(f"{'✓' if ok else '✗'} {config['name']}: mémoire estimée "
+                            f"{format_size(estimates[config['name']])}, mesurée "
+                            f"{format_size(run.get('peak_rss'))}")
+    
+    return successful, failed
+
+
+def print_summary(all_configs, runs):
     """
     Affiche un résumé du traitement
+
+    Parameters:
+    -----------
+    all_configs : list of dict
+        Configurations de la grille
+    runs : dict
+        {configuration: exécution} lu dans le registre (RunRegistry.runs)
     """
+    completed = {name for name, run in runs.items() if run['status'] == 'completed'}
     total = len(all_configs)
     completed_count = len(completed)
     pending = total - completed_count
@@ -173,27 +576,95 @@ def print_summary(all_configs, completed):
     print("=" * 80 + "\n")
     
     # Détails des configurations
-    completed_names = set(config['name'] for config in all_configs if config['name'] in completed)
+    symbols = {'completed': "✓", 'running': "…", 'failed': "✗"}
     print("Configurations complétées:")
     for config in all_configs:
-        if config['name'] in completed:
-            status = "✓"
-        else:
-            status = "○"
-        print(f"{status} {config['name']}")
+        run = runs.get(config['name'])
+        if run is None:
+            print(f"○ {config['name']}")
+            continue
+        details = []
+        if run['duration'] is not None:
+            details.append(f"{run['duration']:.1f}s")
+        if run['output_size'] is not None:
+            details.append(f"{run['output_size'] / 1e6:.1f} Mo")
+        if run['status'] == 'failed':
+            details.append(f"erreur: {run['error']}")
+        suffix = f"  ({', '.join(details)})" if details else ""
+        print(f"{symbols.get(run['status'], '○')} {config['name']}{suffix}")
     
     print("\n" + "=" * 80 + "\n")
 
 
-def main():
+def parse_args(argv=None):
+    """
+    Analyse les arguments de la ligne de commande
+    """
+    parser = argparse.ArgumentParser(
+        description="Pipeline de vectorisation: toutes les combinaisons de prétraitement"
+    )
+    parser.add_argument("--list", action="store_true",
+                        help="Lister les configurations et quitter")
+    parser.add_argument("--status", action="store_true",
+                        help="Afficher l'avancement et quitter")
+    parser.add_argument("--config", action="append", metavar="NAME",
+                        help="Ne traiter que cette configuration (répétable)")
+    parser.add_argument("--grid", metavar="FICHIER",
+                        help="Grille de paramètres (.toml, .yaml, .json) à la place de config.PARAM_GRID")
+    parser.add_argument("--sampler", choices=["full", "random", "halving"], default="full",
+                        help="Échantillonnage de la grille (défaut: full)")
+    parser.add_argument("--n-samples", type=int,
+                        help="Nombre de configurations tirées (random / halving)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Graine aléatoire de l'échantillonnage")
+    parser.add_argument("--no-row-cache", action="store_true",
+                        help="Ne pas utiliser le cache persistant des prétraitements par ligne")
+    parser.add_argument("--max-memory", metavar="TAILLE",
+                        help="Budget mémoire (ex: 8G): configurations traitées en parallèle "
+                             "tant que la somme des pics estimés reste sous le budget")
+    parser.add_argument("--jobs", type=int, default=MEMORY_MAX_JOBS,
+                        help="Configurations en parallèle au plus avec --max-memory")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """
     Fonction principale
     """
+    args = parse_args(argv)
+    
+    # Générer toutes les configurations
+    all_configs = generate_all_configs(load_grid(args.grid), method=args.sampler,
+                                       n_samples=args.n_samples, seed=args.seed)
+    
+    if args.list:
+        for config in all_configs:
+            print(config['name'])
+        return 0, 0
+    
+    if args.status:
+        print_summary(all_configs, get_registry().runs())
+        return 0, 0
+    
+    if args.config:
+        unknown = set(args.config) - {config['name'] for config in all_configs}
+        if unknown:
+            raise SystemExit(f"Configuration(s) inconnue(s): {', '.join(sorted(unknown))}")
+        all_configs = [config for config in all_configs if config['name'] in args.config]
+    
+    setup_logging()
     logger.info("Démarrage du pipeline de vectorisation")
     logger.info(f"Répertoire de sortie: {OUTPUT_DIR}")
     
-    # Générer toutes les configurations
-    all_configs = generate_all_configs()
+    row_cache = None
+    if ROW_CACHE_ENABLED and not args.no_row_cache:
+        from row_cache import RowCache
+        row_cache = RowCache()
+        logger.info(f"Cache de lignes: {row_cache.path}")
+    
+    if args.sampler == "halving":
+        all_configs = select_by_halving(all_configs, row_cache=row_cache, seed=args.seed)
+    
     logger.info(f"Total de configurations à traiter: {len(all_configs)}")
     
     # Charger les configurations déjà complétées
@@ -205,7 +676,18 @@ def main():
         for config_name in sorted(completed_configs):
             logger.info(f"  - {config_name}")
     
-    # Traiter chaque configuration
+    if args.max_memory:
+        pending = [config for config in all_configs if config['name'] not in completed_configs]
+        successful, failed = run_with_memory_budget(
+            pending, parse_size(args.max_memory), n_jobs=args.jobs,
+            use_row_cache=row_cache is not None
+        )
+        print_summary(all_configs, get_registry().runs())
+        logger.info(f"Pipeline terminée: {successful} réussies, {failed} échouées")
+        return successful, failed
+    
+    # Traiter chaque configuration (les étapes amont communes sont réutilisées)
+    cache = StageCache()
     successful = 0
     failed = 0
     
@@ -218,13 +700,13 @@ def main():
             continue
         
         # Traiter la configuration
-        if process_config(config):
+        if process_config(config, cache, row_cache):
             successful += 1
         else:
             failed += 1
     
     # Afficher le résumé final
-    print_summary(all_configs, get_completed_configs())
+    print_summary(all_configs, get_registry().runs())
     
     logger.info(f"Pipeline terminée: {successful} réussies, {failed} échouées")
     
@@ -0,0 +1,174 @@
+"""
+Script 06b : TF-IDF sur n-grammes de caractères hachés (analyzer 'char_wb')
+Input: Dataframe avec colonne 'texte_lowercased'
+Output: Matrice TF-IDF creuse sur les n-grammes de caractères
+
+Alternative aux n-grammes de mots: robuste aux fautes de frappe et aux
+élisions (l'article, tres/très) sans passer par spaCy. Les n-grammes sont
+hachés (HashingVectorizer): aucun dictionnaire de vocabulaire n'est construit,
+la mémoire reste bornée même pour de grands intervalles de n.
+"""
+import logging
+import numpy as np
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.utils import murmurhash3_32
+
+from scripts.tfidf import tfidf_inplace
+
+logger = logging.getLogger(__name__)
+
+
+class HashedCharTfidfVectorizer(TransformerMixin, BaseEstimator):
+    """
+    TF-IDF sur n-grammes de caractères 'char_wb' hachés
+
+    Le filtrage min_df / max_df est appliqué sur les colonnes de hachage:
+    seules les colonnes conservées (columns_) forment la matrice de sortie.
+    Le texte est hashé par lots de batch_size documents.
+    """
+
+    def __init__(self, ngram_range=(2, 5), n_features=2 ** 20, min_df=2, max_df=0.8,
+                 sublinear_tf=True, norm='l2', batch_size=10000, name_sample=2000):
+        self.ngram_range = ngram_range
+        self.n_features = n_features
+        self.min_df = min_df
+        self.max_df = max_df
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.batch_size = batch_size
+        self.name_sample = name_sample
+
+    def _hasher(self):
+        return HashingVectorizer(
+            analyzer='char_wb',
+            ngram_range=tuple(self.ngram_range),
+            n_features=self.n_features,
+            alternate_sign=False,
+            norm=None,
+            lowercase=False,
+            dtype=np.float64
+        )
+
+    def _hash(self, texts):
+        hasher = self._hasher()
+        texts = list(texts)
+        blocks = [hasher.transform(texts[start:start + self.batch_size])
+                  for start in range(0, len(texts), self.batch_size)]
+        return sparse.vstack(blocks, format='csr') if len(blocks) != 1 else blocks[0]
+
+    def _select_columns(self, X):
+        """Restreint X aux colonnes conservées sans matrice de sélection"""
+        mapping = np.full(self.n_features, -1, dtype=np.int64)
+        mapping[self.columns_] = np.arange(len(self.columns_))
+        new_indices = mapping[X.indices]
+        keep = new_indices >= 0
+
+        rows = np.repeat(np.arange(X.shape[0]), np.diff(X.indptr))
+        row_counts = np.bincount(rows[keep], minlength=X.shape[0])
+        indptr = np.concatenate([[0], np.cumsum(row_counts)]).astype(X.indptr.dtype)
+        return sparse.csr_matrix(
+            (X.data[keep], new_indices[keep].astype(X.indices.dtype), indptr),
+            shape=(X.shape[0], len(self.columns_))
+        )
+
+    def _weight(self, X):
+        """Pondération tf (sublinéaire) × idf puis normalisation, en place"""
+        return tfidf_inplace(X, self.idf_, sublinear_tf=self.sublinear_tf, norm=self.norm)
+
+    def fit_transform(self, texts, y=None):
+        texts = list(texts)
+        X = self._hash(texts)
+        n_docs = X.shape[0]
+
+        doc_freq = np.bincount(X.indices, minlength=self.n_features)
+        min_count = self.min_df if isinstance(self.min_df, int) else self.min_df * n_docs
+        max_count = self.max_df if isinstance(self.max_df, int) else self.max_df * n_docs
+        self.columns_ = np.flatnonzero((doc_freq >= min_count) & (doc_freq <= max_count))
+        if len(self.columns_) == 0:
+            raise ValueError("Aucun n-gramme de caractères ne respecte min_df / max_df")
+
+        self.idf_ = np.log((1 + n_docs) / (1 + doc_freq[self.columns_])) + 1
+        self.feature_names_ = self._resolve_names(texts[:self.name_sample])
+        return self._weight(self._select_columns(X))
+
+    def fit(self, texts, y=None):
+        self.fit_transform(texts)
+        return self
+
+    def transform(self, texts):
+        return self._weight(self._select_columns(self._hash(texts)))
+
+    def _resolve_names(self, texts):
+        """
+        Retrouve un n-gramme représentatif pour chaque colonne conservée
+        en ré-analysant un échantillon de textes ('#<colonne>' sinon)
+        """
+        analyzer = self._hasher().build_analyzer()
+        position = {column: i for i, column in enumerate(self.columns_)}
+        names = [f"#{column}" for column in self.columns_]
+        resolved = set()
+        for text in texts:
+            for ngram in analyzer(text):
+                column = abs(murmurhash3_32(ngram, seed=0)) % self.n_features
+                i = position.get(column)
+                if i is not None and i not in resolved:
+                    names[i] = ngram
+                    resolved.add(i)
+        return names
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray(self.feature_names_, dtype=object)
+
+
+def apply_char_tfidf(df, ngram_range=(2, 5), min_df=2, max_df=0.8, sublinear_tf=True,
+                     n_features=2 ** 20, norm='l2'):
+    """
+    Applique TF-IDF sur les n-grammes de caractères du texte en minuscules
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Dataframe avec colonne 'texte_lowercased'
+    ngram_range : tuple
+        Longueurs min et max des n-grammes de caractères
+    min_df : int
+        Fréquence minimale d'un n-gramme
+    max_df : float
+        Ratio maximal de documents
+    sublinear_tf : bool
+        Remplacer tf par 1 + log(tf)
+    n_features : int
+        Nombre de colonnes de hachage
+    norm : str ou None
+        Normalisation des lignes ('l2', 'l1' ou None)
+
+    Returns:
+    --------
+    X_tfidf : scipy sparse matrix
+        Matrice TF-IDF
+    feature_names : list
+        N-grammes représentatifs de chaque colonne
+    vectorizer : HashedCharTfidfVectorizer
+        L'objet vectoriseur
+    """
+    logger.info(f"Application de TF-IDF sur n-grammes de caractères {tuple(ngram_range)}...")
+
+    vectorizer = HashedCharTfidfVectorizer(
+        ngram_range=ngram_range,
+        n_features=n_features,
+        min_df=min_df,
+        max_df=max_df,
+        sublinear_tf=sublinear_tf,
+        norm=norm
+    )
+
+    X_tfidf = vectorizer.fit_transform(df['texte_lowercased'])
+    feature_names = vectorizer.get_feature_names_out().tolist()
+
+    logger.info(f"Colonnes de hachage conservées: {len(feature_names)} / {n_features}")
+    logger.info(f"Matrice TF-IDF: {X_tfidf.shape}")
+    logger.info(f"Densité: {X_tfidf.nnz / (X_tfidf.shape[0] * X_tfidf.shape[1]):.4f}")
+
+    return X_tfidf, feature_names, vectorizer
@@ -0,0 +1,300 @@
+"""
+Script 09 : Clustering des avis par thème (k-means sphérique mini-batch)
+Input: Matrice TF-IDF normalisée (creuse) d'un résultat FINAL, ou blocs CSR
+Output: Centroïdes unitaires, cluster de chaque avis, termes dominants par cluster
+
+Les avis sont regroupés par similarité cosinus (k-means sphérique): les
+centroïdes restent de norme 1 et l'affectation est argmax(X @ centroïdes.T),
+calculée directement sur les lignes creuses. L'ajustement est mini-batch
+(Sculley, 2010): chaque lot de lignes déplace les centroïdes qu'il touche
+avec un pas 1 / (avis déjà affectés), puis les renormalise; la mémoire de
+travail reste en O(batch_size × k + k × n_features) quelle que soit la taille
+du corpus.
+
+Usage (sur un résultat FINAL existant):
+    python scripts/clustering.py --config config_L1_S1_LEM1_NG2 --n-clusters 20
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+if __name__ == "__main__":
+    # Exécution directe (python scripts/clustering.py): config.py est dans le répertoire parent
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import (
+    CLUSTERING_N_CLUSTERS, CLUSTERING_BATCH_SIZE, CLUSTERING_N_EPOCHS,
+    CLUSTERING_N_JOBS, CLUSTERING_TOP_TERMS
+)
+
+logger = logging.getLogger(__name__)
+
+
+def iter_row_blocks(X, batch_size, order=None):
+    """
+    Blocs CSR de `batch_size` lignes de X (dans l'ordre `order` si donné)
+    """
+    n_samples = X.shape[0]
+    for start in range(0, n_samples, batch_size):
+        if order is None:
+            yield X[start:start + batch_size]
+        else:
+            yield X[order[start:start + batch_size]]
+
+
+class SphericalMiniBatchKMeans:
+    """
+    k-means sphérique mini-batch sur matrices creuses
+
+    Parameters:
+    -----------
+    n_clusters : int
+        Nombre de clusters
+    batch_size : int
+        Lignes par mini-batch (le premier lot doit en contenir au moins n_clusters)
+    n_epochs : int
+        Passes sur la matrice dans fit() (les flux de blocs sont lus une fois)
+    n_jobs : int
+        Threads pour l'affectation par blocs (predict / transform)
+    random_state : int
+        Graine aléatoire (initialisation k-means++, ordre des lignes)
+    """
+
+    def __init__(self, n_clusters=20, batch_size=4096, n_epochs=5, n_jobs=1, random_state=42):
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.n_epochs = n_epochs
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self._rng = np.random.default_rng(random_state)
+
+    def _init_centers(self, X):
+        """Initialisation k-means++ (distance cosinus) sur le premier lot"""
+        if X.shape[0] < self.n_clusters:
+            raise ValueError(f"Le premier lot contient {X.shape[0]} lignes, "
+                             f"moins que n_clusters={self.n_clusters}")
+        chosen = [self._rng.integers(X.shape[0])]
+        distance = 1 - (X @ X[chosen[0]].T).toarray().ravel()
+        for _ in range(1, self.n_clusters):
+            weights = np.clip(distance, 0, None)
+            total = weights.sum()
+            candidate = (self._rng.choice(X.shape[0], p=weights / total) if total > 0
+                         else self._rng.integers(X.shape[0]))
+            chosen.append(candidate)
+            distance = np.minimum(distance, 1 - (X @ X[candidate].T).toarray().ravel())
+
+        self.cluster_centers_ = normalize(X[chosen].toarray())
+        self.counts_ = np.zeros(self.n_clusters, dtype=np.int64)
+        self.n_features_in_ = X.shape[1]
+
+    def _similarities(self, X):
+        """Similarités cosinus lignes × centroïdes (dense n_lignes × k)"""
+        return np.asarray(X @ self.cluster_centers_.T)
+
+    def partial_fit(self, X):
+        """
+        Met à jour les centroïdes avec un lot de lignes (CSR, normalisées en l2)
+        """
+        X = normalize(sparse.csr_matrix(X, dtype=np.float64))
+        if not hasattr(self, 'cluster_centers_'):
+            self._init_centers(X)
+
+        labels = self._similarities(X).argmax(axis=1)
+        # Somme des lignes de chaque cluster: produit creux indicatrice × X
+        indicator = sparse.csr_matrix(
+            (np.ones(X.shape[0]), (labels, np.arange(X.shape[0]))),
+            shape=(self.n_clusters, X.shape[0])
+        )
+        sums = indicator @ X
+        batch_counts = np.bincount(labels, minlength=self.n_clusters)
+
+        for cluster in np.flatnonzero(batch_counts):
+            self.counts_[cluster] += batch_counts[cluster]
+            eta = batch_counts[cluster] / self.counts_[cluster]
+            center = self.cluster_centers_[cluster]
+            row = sums.getrow(cluster)
+            center *= 1 - eta
+            center[row.indices] += (eta / batch_counts[cluster]) * row.data
+            norm = np.linalg.norm(center)
+            if norm > 0:
+                center /= norm
+        return self
+
+    def fit(self, X):
+        """
+        Ajuste sur une matrice creuse (n_epochs passes, lignes mélangées) ou
+        sur un itérable de blocs CSR (une seule passe, dans l'ordre du flux)
+        """
+        if sparse.issparse(X):
+            X = sparse.csr_matrix(X)
+            for epoch in range(self.n_epochs):
+                order = self._rng.permutation(X.shape[0])
+                for block in iter_row_blocks(X, self.batch_size, order):
+                    self.partial_fit(block)
+                logger.info(f"Époque {epoch + 1}/{self.n_epochs}: "
+                            f"cohésion moyenne {self.cohesion(X):.4f}")
+        else:
+            for block in X:
+                self.partial_fit(block)
+        return self
+
+    def _assign_blocks(self, X, func, n_jobs=None):
+        X = sparse.csr_matrix(X)
+        blocks = list(iter_row_blocks(X, self.batch_size))
+        n_jobs = self.n_jobs if n_jobs is None else n_jobs
+        if len(blocks) <= 1 or n_jobs == 1:
+            results = [func(block) for block in blocks]
+        else:
+            from joblib import Parallel, delayed
+
+            # Le produit creux × dense de scipy libère le GIL: des threads suffisent
+            results = Parallel(n_jobs=n_jobs, prefer="threads")(
+                delayed(func)(block) for block in blocks)
+        return results
+
+    def transform(self, X, n_jobs=None):
+        """
+        Similarités cosinus de chaque ligne avec chaque centroïde (dense n × k)
+        """
+        results = self._assign_blocks(X, lambda block: self._similarities(normalize(block)), n_jobs)
+        return np.vstack(results) if results else np.empty((0, self.n_clusters))
+
+    def predict(self, X, n_jobs=None):
+        """
+        Cluster de chaque ligne (affectation parallèle par blocs)
+        """
+        results = self._assign_blocks(
+            X, lambda block: self._similarities(normalize(block)).argmax(axis=1), n_jobs)
+        return np.concatenate(results) if results else np.empty(0, dtype=np.intp)
+
+    def fit_predict(self, X):
+        return self.fit(X).predict(X)
+
+    def cohesion(self, X, n_jobs=None):
+        """
+        Similarité cosinus moyenne des lignes à leur centroïde
+        """
+        results = self._assign_blocks(
+            X, lambda block: self._similarities(normalize(block)).max(axis=1), n_jobs)
+        return float(np.concatenate(results).mean()) if results else 0.0
+
+    def top_terms(self, feature_names, n_terms=10):
+        """
+        Les n_terms termes de plus fort poids de chaque centroïde
+        """
+        feature_names = np.asarray(feature_names, dtype=object)
+        n_terms = min(n_terms, self.cluster_centers_.shape[1])
+        top = np.argpartition(-self.cluster_centers_, n_terms - 1, axis=1)[:, :n_terms]
+        terms = []
+        for center, columns in zip(self.cluster_centers_, top):
+            columns = columns[np.argsort(-center[columns], kind='stable')]
+            terms.append(feature_names[columns].tolist())
+        return terms
+
+
+def apply_clustering(X_normalized, feature_names, n_clusters=CLUSTERING_N_CLUSTERS,
+                     batch_size=CLUSTERING_BATCH_SIZE, n_epochs=CLUSTERING_N_EPOCHS,
+                     n_jobs=CLUSTERING_N_JOBS, n_terms=CLUSTERING_TOP_TERMS, random_state=42):
+    """
+    Regroupe les avis en clusters thématiques (k-means sphérique mini-batch)
+
+    Parameters:
+    -----------
+    X_normalized : scipy sparse matrix ou itérable de blocs CSR
+        Matrice TF-IDF normalisée, ou flux de blocs de lignes (une passe)
+    feature_names : list
+        Vocabulaire (noms des colonnes)
+    n_clusters : int
+        Nombre de clusters
+    batch_size : int
+        Lignes par mini-batch
+    n_epochs : int
+        Passes sur la matrice
+    n_jobs : int
+        Threads pour l'affectation
+    n_terms : int
+        Termes dominants conservés par cluster
+    random_state : int
+        Graine aléatoire
+
+    Returns:
+    --------
+    clusters : dict
+        'model' (SphericalMiniBatchKMeans), 'labels' (cluster de chaque avis,
+        None pour un flux de blocs), 'sizes', 'top_terms'
+    """
+    logger.info(f"Clustering sphérique mini-batch: {n_clusters} clusters, "
+                f"lots de {batch_size} lignes")
+    model = SphericalMiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size,
+                                     n_epochs=n_epochs, n_jobs=n_jobs,
+                                     random_state=random_state)
+    model.fit(X_normalized)
+
+    labels = None
+    sizes = model.counts_
+    if sparse.issparse(X_normalized):
+        labels = model.predict(X_normalized)
+        sizes = np.bincount(labels, minlength=n_clusters)
+
+    top_terms = model.top_terms(feature_names, n_terms)
+    for cluster, (size, terms) in enumerate(zip(sizes, top_terms)):
+        logger.info(f"  Cluster {cluster:>2} ({size} avis): {', '.join(map(str, terms))}")
+
+    return {'model': model, 'labels': labels, 'sizes': sizes, 'top_terms': top_terms}
+
+
+def save_clusters(clusters, filepath):
+    """
+    Sauvegarde centroïdes, affectations et termes dominants (cf. serialization.py)
+    """
+    import serialization
+
+    serialization.dump(clusters, filepath, codec=serialization.artifact_codec("final"))
+    logger.info(f"Clusters sauvegardés: {filepath}")
+    return filepath
+
+
+def load_clusters(filepath):
+    """
+    Charge les clusters sauvegardés par save_clusters (None si absents)
+    """
+    import serialization
+
+    filepath = Path(filepath)
+    return serialization.load(filepath) if filepath.exists() else None
+
+
+def main(argv=None):
+    # Import par le chemin du module: le modèle est sérialisé comme
+    # scripts.clustering.SphericalMiniBatchKMeans (et non __main__.…),
+    # relisible par inference.FittedConfig et service.py
+    from scripts.clustering import apply_clustering, save_clusters
+    from utils import get_output_file, load_final, setup_logging
+
+    parser = argparse.ArgumentParser(description="Clustering des avis d'une configuration FINAL")
+    parser.add_argument("--config", required=True, metavar="NAME")
+    parser.add_argument("--n-clusters", type=int, default=CLUSTERING_N_CLUSTERS)
+    parser.add_argument("--batch-size", type=int, default=CLUSTERING_BATCH_SIZE)
+    parser.add_argument("--epochs", type=int, default=CLUSTERING_N_EPOCHS)
+    parser.add_argument("--n-jobs", type=int, default=CLUSTERING_N_JOBS)
+    parser.add_argument("--n-terms", type=int, default=CLUSTERING_TOP_TERMS)
+    args = parser.parse_args(argv)
+    setup_logging(to_file=False)
+
+    final = load_final(args.config)
+    clusters = apply_clustering(
+        final['X_normalized'], final['feature_names'], n_clusters=args.n_clusters,
+        batch_size=args.batch_size, n_epochs=args.epochs, n_jobs=args.n_jobs,
+        n_terms=args.n_terms
+    )
+    save_clusters(clusters, get_output_file(args.config, "FINAL_clusters"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
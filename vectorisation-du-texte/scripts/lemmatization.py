@@ -46,7 +46,34 @@ def lemmatize_text(text):
     return ' '.join(lemmas)
 
 
-def apply_lemmatization(df, apply_lemmatization=True):
+def lemmatize_texts(texts, batch_size=256, log_progress=True):
+    """
+    Lemmatise une liste de textes en lot (nlp.pipe)
+
+    log_progress=False pour les petits lots répétés (service de scoring)
+    """
+    nlp = get_spacy_model()
+    lemmatized_texts = []
+    total = len(texts)
+    for i, doc in enumerate(nlp.pipe(texts, batch_size=batch_size)):
+        if log_progress and i % 1000 == 0:
+            logger.info(f"Progression: {i}/{total}")
+        lemmatized_texts.append(' '.join(token.lemma_ for token in doc if not token.is_punct))
+    return lemmatized_texts
+
+
+def get_model_version(model_name='fr_core_news_sm'):
+    """
+    Version du modèle spaCy installé, sans le charger (clé du cache de lignes)
+    """
+    from importlib.metadata import version, PackageNotFoundError
+    try:
+        return f"{model_name}=={version(model_name)}"
+    except PackageNotFoundError:
+        return model_name
+
+
+def apply_lemmatization(df, apply_lemmatization=True, cache=None, field='texte'):
     """
     Applique la lemmatisation au texte
     
@@ -56,6 +83,10 @@ def apply_lemmatization(df, apply_lemmatization=True):
         Dataframe avec colonne 'texte_no_stopwords'
     apply_lemmatization : bool
         Si True, applique la lemmatisation. Si False, garde le texte original
+    cache : RowCache, optionnel
+        Cache persistant par ligne: spaCy n'est chargé que si des lignes manquent
+    field : str
+        Préfixe des colonnes traitées ('texte', ou 'titre' / 'corps' en multi-champs)
     
     Returns:
     --------
@@ -63,28 +94,24 @@ def apply_lemmatization(df, apply_lemmatization=True):
         Dataframe avec colonne 'texte_lemmatized'
     """
     df = df.copy()
+    source, target = f'{field}_no_stopwords', f'{field}_lemmatized'
     
     if apply_lemmatization:
         logger.info("Application de la lemmatisation...")
         logger.info("Cette étape peut prendre du temps...")
         
-        texts = df['texte_no_stopwords'].tolist()
-        lemmatized_texts = []
-        
-        total = len(texts)
-        for i, text in enumerate(texts):
-            if i % 100 == 0:
-                logger.info(f"Progression: {i}/{total}")
-            
-            lemmatized_texts.append(lemmatize_text(text))
+        from row_cache import cached_apply
         
-        df['texte_lemmatized'] = lemmatized_texts
+        texts = df[source].tolist()
+        df[target] = cached_apply(
+            cache, "lemmatize", get_model_version(), texts, lemmatize_texts
+        )
         logger.info("Lemmatisation appliquée")
     else:
         logger.info("Lemmatisation désactivée, copie du texte original...")
-        df['texte_lemmatized'] = df['texte_no_stopwords']
+        df[target] = df[source]
     
-    logger.info(f"Exemple avant: {df['texte_no_stopwords'].iloc[0][:80]}")
-    logger.info(f"Exemple après: {df['texte_lemmatized'].iloc[0][:80]}")
+    logger.info(f"Exemple avant: {df[source].iloc[0][:80]}")
+    logger.info(f"Exemple après: {df[target].iloc[0][:80]}")
     
     return df
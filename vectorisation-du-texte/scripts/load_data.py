@@ -1,44 +1,158 @@
 """
-Script 01 : Charger les données brutes depuis le CSV
+Script 01 : Charger les données brutes (CSV, Parquet ou Arrow IPC)
 Output: Dataframe pandas avec les colonnes textuelles et la cible
+
+Le fichier est lu avec pyarrow, limité aux colonnes utiles (corps, titre,
+avis). La fusion titre + corps, le strip et le filtrage des lignes vides
+sont des noyaux vectorisés pyarrow.compute sur les colonnes Arrow; les
+colonnes texte restent des `string[pyarrow]` (buffers Arrow contigus, pas
+un objet Python `str` par cellule).
 """
 import pandas as pd
 import logging
+import sys
 from pathlib import Path
 
+if __name__ == "__main__":
+    # Exécution directe (python scripts/load_data.py): config.py est dans le répertoire parent
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import INPUT_FILE, TEXT_COLUMNS, TARGET_COLUMN
+
 logger = logging.getLogger(__name__)
 
+# Colonnes lues (projection): les autres colonnes de l'export sont ignorées
+LOAD_COLUMNS = TEXT_COLUMNS + [TARGET_COLUMN]
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
 
-def load_data(input_file=None):
+
+def read_table(input_file, columns=LOAD_COLUMNS):
     """
-    Charge les données depuis le fichier CSV
+    Lit `columns` d'un fichier CSV, Parquet ou Arrow IPC en table pyarrow
+
+    Les colonnes sont lues en large_string, le type de stockage de
+    `string[pyarrow]`: la conversion en DataFrame ne recopie pas les textes.
+    """
+    import pyarrow as pa
+
+    suffix = Path(input_file).suffix.lower()
+    if suffix in PARQUET_SUFFIXES:
+        import pyarrow.parquet as pq
+        table = pq.read_table(input_file, columns=columns)
+    elif suffix in ARROW_SUFFIXES:
+        import pyarrow.feather as feather
+        table = feather.read_table(input_file, columns=columns, memory_map=True)
+    elif suffix == ".csv":
+        import pyarrow.csv as pv
+        table = pv.read_csv(input_file, convert_options=pv.ConvertOptions(
+            include_columns=columns,
+            column_types={column: pa.large_string() for column in columns},
+            strings_can_be_null=True
+        ))
+    else:
+        raise ValueError(f"Format d'entrée non supporté: {input_file} (.csv, .parquet, .arrow)")
+
+    # Parquet / Arrow stockent souvent des string (offsets 32 bits) ou des dictionnaires
+    for i, field in enumerate(table.schema):
+        if field.type != pa.large_string():
+            table = table.set_column(i, field.name, table.column(i).cast(pa.large_string()))
+    return table
+
+
+def build_text_columns(table, fields=None):
+    """
+    Ajoute 'texte_complet' (titre + corps) et '<champ>_complet', puis retire
+    les lignes au texte vide, avec les noyaux pyarrow.compute
+
+    Les noyaux sont appliqués lot par lot (record batches): la fusion et le
+    strip n'allouent qu'un lot intermédiaire à la fois, pas une colonne entière.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    separator = pa.scalar(' ', pa.large_string())
+
+    def strip(column):
+        column = pc.utf8_trim_whitespace(column)
+        return pc.fill_null(column, '') if column.null_count else column
+
+    batches = table.to_batches()
+    texte = pa.chunked_array([
+        pc.utf8_trim_whitespace(pc.binary_join_element_wise(
+            batch.column('titre'), batch.column('corps'), separator,
+            null_handling='replace', null_replacement=''
+        ))
+        for batch in batches
+    ], type=pa.large_string())
+    table = table.append_column('texte_complet', texte)
+
+    for field in fields or []:
+        column = pa.chunked_array([strip(batch.column(field)) for batch in batches],
+                                  type=pa.large_string())
+        table = table.append_column(f'{field}_complet', column)
+
+    # Tampons de lecture libérés par pyarrow: rendus au système
+    pa.default_memory_pool().release_unused()
+
+    non_empty = pc.greater(pc.utf8_length(texte), 0)
+    if pc.all(non_empty).as_py() is not False:
+        # Aucune ligne vide: pas de copie filtrée de la table
+        return table
+    return table.filter(non_empty)
+
+
+def to_pandas(table):
+    """
+    Table pyarrow -> DataFrame aux colonnes `string[pyarrow]` (sans copie en objets Python)
+    """
+    import pyarrow as pa
+
+    dtype = pd.StringDtype("pyarrow")
+    return table.to_pandas(types_mapper={pa.string(): dtype, pa.large_string(): dtype}.get,
+                           self_destruct=True)
+
+
+def load_data(input_file=None, fields=None):
+    """
+    Charge les données depuis le fichier CSV, Parquet ou Arrow IPC
+
+    Parameters:
+    -----------
+    input_file : str ou Path, optionnel
+        Fichier .csv, .parquet ou .arrow/.feather (par défaut config.INPUT_FILE,
+        avis_annotés.csv à la racine du projet)
+    fields : list of str, optionnel
+        Colonnes textuelles à préparer séparément (mode multi-champs):
+        crée une colonne '<champ>_complet' par champ en plus de 'texte_complet'
     """
     if input_file is None:
-        # Remonter deux niveaux depuis scripts/ vers la racine
-        input_file = Path(__file__).parent.parent.parent / "avis_annotés.csv"
-    
+        input_file = INPUT_FILE
+
     logger.info(f"Chargement des données depuis {input_file}")
-    
-    # Charger le CSV
-    df = pd.read_csv(input_file)
-    
-    logger.info(f"Données chargées: {len(df)} avis")
-    logger.info(f"Colonnes: {list(df.columns)}")
-    
-    # Fusionner le titre et le corps pour le traitement
-    df['texte_complet'] = df['titre'].fillna('') + ' ' + df['corps'].fillna('')
-    df['texte_complet'] = df['texte_complet'].str.strip()
-    
+
+    table = read_table(input_file)
+    initial_count = table.num_rows
+
+    logger.info(f"Données chargées: {initial_count} avis")
+    logger.info(f"Colonnes: {table.column_names}")
+
+    # Fusionner le titre et le corps pour le traitement, supprimer les lignes vides
+    table = build_text_columns(table, fields)
+    df = to_pandas(table)
+    del table
+
     logger.info(f"Texte fusionné créé (titre + corps)")
-    logger.info(f"Exemple premier avis:\n{df['texte_complet'].iloc[0][:200]}...")
-    
-    # Supprimer les lignes avec texte vide
-    initial_count = len(df)
-    df = df[df['texte_complet'].str.len() > 0].reset_index(drop=True)
+    for field in fields or []:
+        logger.info(f"Champ préparé séparément: {field}")
+    if len(df):
+        logger.info(f"Exemple premier avis:\n{df['texte_complet'].iloc[0][:200]}...")
+
     logger.info(f"Lignes supprimées (texte vide): {initial_count - len(df)}")
-    
     logger.info(f"Données finales: {len(df)} avis")
-    
+    logger.info(f"Mémoire du DataFrame: {df.memory_usage(deep=True).sum() / 1e6:.1f} Mo")
+
     return df
 
 
@@ -9,7 +9,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def apply_lowercasing(df, apply_lowercasing=True):
+def apply_lowercasing(df, apply_lowercasing=True, field='texte'):
     """
     Transforme tous les caractères en minuscules
     
@@ -19,6 +19,8 @@ def apply_lowercasing(df, apply_lowercasing=True):
         Dataframe avec colonne 'texte_complet'
     apply_lowercasing : bool
         Si True, applique le lowercasing. Si False, garde le texte original
+    field : str
+        Préfixe des colonnes traitées ('texte', ou 'titre' / 'corps' en multi-champs)
     
     Returns:
     --------
@@ -26,16 +28,17 @@ def apply_lowercasing(df, apply_lowercasing=True):
         Dataframe avec colonne 'texte_lowercased'
     """
     df = df.copy()
+    source, target = f'{field}_complet', f'{field}_lowercased'
     
     if apply_lowercasing:
         logger.info("Application du lowercasing...")
-        df['texte_lowercased'] = df['texte_complet'].str.lower()
+        df[target] = df[source].str.lower()
         logger.info("Lowercasing appliqué")
     else:
         logger.info("Lowercasing désactivé, copie du texte original...")
-        df['texte_lowercased'] = df['texte_complet']
+        df[target] = df[source]
     
-    logger.info(f"Exemple avant: {df['texte_complet'].iloc[0][:80]}")
-    logger.info(f"Exemple après: {df['texte_lowercased'].iloc[0][:80]}")
+    logger.info(f"Exemple avant: {df[source].iloc[0][:80]}")
+    logger.info(f"Exemple après: {df[target].iloc[0][:80]}")
     
     return df
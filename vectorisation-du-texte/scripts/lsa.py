@@ -0,0 +1,184 @@
+"""
+Script 08 : Réduction de dimension LSA (Latent Semantic Analysis)
+Input: Matrice TF-IDF normalisée (creuse)
+Output: Embeddings denses de dimension k (float32) + composantes SVD
+"""
+import logging
+import numpy as np
+from scipy import sparse
+from sklearn.decomposition import TruncatedSVD
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalTruncatedSVD:
+    """
+    SVD tronquée randomisée calculée par blocs de lignes
+
+    X (creuse) reste entièrement en mémoire mais n'est jamais densifiée: les
+    produits X @ M et Q.T @ X sont calculés par blocs de `batch_size` lignes.
+    En plus de X, la mémoire de travail est dominée par la base orthonormée
+    Q dense n_samples × (k + p) et les matrices (k + p) × n_features; les
+    embeddings (transform) sont écrits bloc par bloc dans `out`.
+
+    Expose la même interface que sklearn.decomposition.TruncatedSVD
+    (fit, transform, fit_transform, components_, explained_variance_ratio_).
+    """
+
+    def __init__(self, n_components=100, n_oversamples=10, n_iter=4,
+                 batch_size=10000, random_state=42):
+        self.n_components = n_components
+        self.n_oversamples = n_oversamples
+        self.n_iter = n_iter
+        self.batch_size = batch_size
+        self.random_state = random_state
+
+    def _blocks(self, X):
+        for start in range(0, X.shape[0], self.batch_size):
+            yield start, X[start:start + self.batch_size]
+
+    def _left_product(self, X, M):
+        """Calcule X @ M bloc par bloc (résultat dense n_samples × l)"""
+        out = np.empty((X.shape[0], M.shape[1]), dtype=np.float64)
+        for start, block in self._blocks(X):
+            out[start:start + block.shape[0]] = block @ M
+        return out
+
+    def _right_product(self, Q, X):
+        """Calcule Q.T @ X bloc par bloc (résultat dense l × n_features)"""
+        out = np.zeros((Q.shape[1], X.shape[1]), dtype=np.float64)
+        for start, block in self._blocks(X):
+            out += (block.T @ Q[start:start + block.shape[0]]).T
+        return out
+
+    def fit(self, X):
+        X = sparse.csr_matrix(X)
+        rng = np.random.default_rng(self.random_state)
+        n_random = self.n_components + self.n_oversamples
+
+        omega = rng.standard_normal((X.shape[1], n_random))
+        Q, _ = np.linalg.qr(self._left_product(X, omega))
+        del omega
+        for _ in range(self.n_iter):
+            Z, _ = np.linalg.qr(self._right_product(Q, X).T)
+            Q, _ = np.linalg.qr(self._left_product(X, Z))
+
+        B = self._right_product(Q, X)
+        del Q
+        _, s, Vt = np.linalg.svd(B, full_matrices=False)
+
+        k = self.n_components
+        self.components_ = Vt[:k]
+        self.singular_values_ = s[:k]
+
+        # Variance des embeddings accumulée par blocs (sans matérialiser X @ V)
+        sum_ = np.zeros(k)
+        sum_sq = np.zeros(k)
+        for _, block in self._blocks(X):
+            embedded = block @ self.components_.T
+            sum_ += embedded.sum(axis=0)
+            sum_sq += (embedded ** 2).sum(axis=0)
+        mean = sum_ / X.shape[0]
+        self.explained_variance_ = sum_sq / X.shape[0] - mean ** 2
+        self.explained_variance_ratio_ = self.explained_variance_ / self._total_variance(X)
+        return self
+
+    def _total_variance(self, X):
+        sum_ = np.zeros(X.shape[1])
+        sum_sq = np.zeros(X.shape[1])
+        for _, block in self._blocks(X):
+            sum_ += np.asarray(block.sum(axis=0)).ravel()
+            sum_sq += np.asarray(block.multiply(block).sum(axis=0)).ravel()
+        mean = sum_ / X.shape[0]
+        return (sum_sq / X.shape[0] - mean ** 2).sum()
+
+    def transform(self, X, out=None):
+        """
+        Embeddings X @ components_.T, écrits bloc par bloc dans `out` si donné
+        (ex: memmap float32) au lieu d'un tableau float64 n_samples × k
+        """
+        X = sparse.csr_matrix(X)
+        if out is None:
+            out = np.empty((X.shape[0], self.n_components), dtype=np.float64)
+        for start, block in self._blocks(X):
+            out[start:start + block.shape[0]] = block @ self.components_.T
+        return out
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
+
+
+def open_embeddings(filepath, shape):
+    """
+    Crée un fichier .npy float32 ouvert en memory-map en écriture
+    (relisible avec np.load(filepath, mmap_mode='r'))
+    """
+    return np.lib.format.open_memmap(filepath, mode='w+', dtype=np.float32, shape=shape)
+
+
+def apply_lsa(X_normalized, n_components=100, algorithm='randomized',
+              batch_size=10000, random_state=42, filepath=None):
+    """
+    Calcule des embeddings denses de dimension k par SVD tronquée (LSA)
+
+    Le modèle est ajusté, puis les embeddings sont calculés par blocs de
+    `batch_size` lignes et écrits directement en float32: dans `filepath`
+    (memmap .npy) si donné, sinon dans un tableau en mémoire. Aucune copie
+    float64 complète des embeddings n'est conservée.
+
+    Parameters:
+    -----------
+    X_normalized : scipy sparse matrix
+        Matrice TF-IDF normalisée
+    n_components : int
+        Dimension des embeddings (ramenée à n_features - 1 si nécessaire)
+    algorithm : str
+        'randomized' (TruncatedSVD de scikit-learn, en mémoire: son fit
+        calcule une fois U × Σ en float64) ou 'incremental' (SVD randomisée
+        par blocs de lignes, sans densifier X)
+    batch_size : int
+        Nombre de lignes par bloc (ajustement 'incremental' et écriture des embeddings)
+    random_state : int
+        Graine aléatoire
+    filepath : str ou Path, optionnel
+        Fichier .npy où écrire les embeddings (memory-map)
+
+    Returns:
+    --------
+    X_lsa : numpy array ou memmap (float32)
+        Embeddings denses (n_samples, n_components)
+    svd : TruncatedSVD ou IncrementalTruncatedSVD
+        Le modèle ajusté (composantes réutilisables via svd.transform)
+    """
+    n_components = min(n_components, X_normalized.shape[1] - 1)
+    logger.info(f"LSA ({algorithm}) avec {n_components} composantes...")
+
+    if algorithm == 'randomized':
+        svd = TruncatedSVD(n_components=n_components, algorithm='randomized',
+                           random_state=random_state)
+    elif algorithm == 'incremental':
+        svd = IncrementalTruncatedSVD(n_components=n_components,
+                                      batch_size=batch_size,
+                                      random_state=random_state)
+    else:
+        raise ValueError(f"Algorithme LSA inconnu: {algorithm}")
+
+    svd.fit(X_normalized)
+
+    X = sparse.csr_matrix(X_normalized)
+    shape = (X.shape[0], n_components)
+    if filepath is not None:
+        X_lsa = open_embeddings(filepath, shape)
+    else:
+        X_lsa = np.empty(shape, dtype=np.float32)
+    for start in range(0, X.shape[0], batch_size):
+        block = X[start:start + batch_size]
+        X_lsa[start:start + block.shape[0]] = svd.transform(block)
+
+    logger.info(f"Embeddings LSA: {X_lsa.shape}")
+    logger.info(f"Variance expliquée: {svd.explained_variance_ratio_.sum():.4f}")
+    if filepath is not None:
+        X_lsa.flush()
+        logger.info(f"Embeddings sauvegardés: {filepath}")
+
+    return X_lsa, svd
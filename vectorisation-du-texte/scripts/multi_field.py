@@ -0,0 +1,136 @@
+"""
+Script 06c : TF-IDF multi-champs (titre et corps vectorisés séparément)
+Input: Dataframe avec colonnes '<champ>_lemmatized' (ex: 'titre_lemmatized')
+Output: Matrice TF-IDF creuse [bloc titre | bloc corps], pondérée par champ
+
+Chaque champ a son propre vocabulaire, son propre idf et son propre ordre
+de n-grammes (les titres courts gardent les trigrammes, le corps peut s'en
+passer). Les blocs sont ajustés en parallèle puis concaténés horizontalement
+sans densification.
+"""
+import logging
+import numpy as np
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+from scripts.tfidf import fit_tfidf
+
+logger = logging.getLogger(__name__)
+
+
+class MultiFieldTfidfVectorizer:
+    """
+    Un TfidfVectorizer par champ, blocs pondérés et concaténés en une CSR
+
+    Parameters:
+    -----------
+    field_params : dict
+        {champ: paramètres de fit_tfidf (ngram_range, min_df, ...)}
+    weights : dict
+        {champ: poids du bloc} (1.0 par défaut)
+    norm : str ou None
+        Normalisation des lignes de la matrice concaténée
+    n_jobs : int
+        Nombre de champs ajustés en parallèle
+    """
+
+    def __init__(self, field_params, weights=None, norm='l2', n_jobs=None):
+        self.field_params = field_params
+        self.weights = weights or {}
+        self.norm = norm
+        self.n_jobs = n_jobs
+
+    @property
+    def fields(self):
+        return list(self.field_params)
+
+    def _combine(self, blocks):
+        """Pondère chaque bloc en place, concatène, normalise les lignes"""
+        for field, X in zip(self.fields, blocks):
+            X.data *= self.weights.get(field, 1.0)
+        X = sparse.hstack(blocks, format='csr')
+        if self.norm:
+            normalize(X, norm=self.norm, copy=False)
+        return X
+
+    def fit_transform(self, df):
+        results = Parallel(n_jobs=self.n_jobs or len(self.fields))(
+            delayed(fit_tfidf)(df[f'{field}_lemmatized'], **self.field_params[field])
+            for field in self.fields
+        )
+        blocks = [X for X, _ in results]
+        self.vectorizers_ = {field: vectorizer
+                             for field, (_, vectorizer) in zip(self.fields, results)}
+        self.block_sizes_ = [X.shape[1] for X in blocks]
+        return self._combine(blocks)
+
+    def fit(self, df):
+        self.fit_transform(df)
+        return self
+
+    def transform(self, df):
+        blocks = [self.vectorizers_[field].transform(df[f'{field}_lemmatized'])
+                  for field in self.fields]
+        return self._combine(blocks)
+
+    def get_feature_names_out(self):
+        return np.concatenate([
+            [f"{field}:{name}" for name in self.vectorizers_[field].get_feature_names_out()]
+            for field in self.fields
+        ])
+
+
+def apply_multi_field_tfidf(df, fields, ngram=1, max_ngram=None, weights=None, min_df=2,
+                            max_df=0.8, sublinear_tf=True, token_pattern=r'\b\w+\b',
+                            norm='l2', n_jobs=None):
+    """
+    Applique TF-IDF séparément à chaque champ et concatène les blocs
+
+    Parameters:
+    -----------
+    df : DataFrame
+        Dataframe avec colonnes '<champ>_lemmatized'
+    fields : list of str
+        Champs à vectoriser (ex: ['titre', 'corps'])
+    ngram : int
+        Ordre maximal des n-grammes de la configuration
+    max_ngram : dict, optionnel
+        {champ: ordre maximal autorisé pour ce champ} (plafonne `ngram`)
+    weights : dict, optionnel
+        {champ: poids du bloc}
+    min_df, max_df, sublinear_tf, token_pattern, norm :
+        Paramètres TF-IDF communs à tous les champs
+    n_jobs : int, optionnel
+        Nombre de champs ajustés en parallèle (défaut: un par champ)
+
+    Returns:
+    --------
+    X_tfidf : scipy sparse matrix
+        Matrice TF-IDF concaténée (lignes normalisées)
+    feature_names : list
+        Noms '<champ>:<n-gramme>'
+    vectorizer : MultiFieldTfidfVectorizer
+        L'objet vectoriseur
+    """
+    max_ngram = max_ngram or {}
+    field_params = {}
+    for field in fields:
+        field_ngram = min(ngram, max_ngram.get(field, ngram))
+        field_params[field] = dict(ngram_range=(1, field_ngram), min_df=min_df, max_df=max_df,
+                                   sublinear_tf=sublinear_tf, token_pattern=token_pattern,
+                                   norm=norm)
+        logger.info(f"Champ '{field}': n-grammes (1, {field_ngram}), "
+                    f"poids {(weights or {}).get(field, 1.0)}")
+
+    vectorizer = MultiFieldTfidfVectorizer(field_params, weights=weights, norm=norm,
+                                           n_jobs=n_jobs)
+    X_tfidf = vectorizer.fit_transform(df)
+    feature_names = vectorizer.get_feature_names_out().tolist()
+
+    for field, size in zip(fields, vectorizer.block_sizes_):
+        logger.info(f"Vocabulaire '{field}': {size} n-grammes")
+    logger.info(f"Matrice TF-IDF multi-champs: {X_tfidf.shape}")
+    logger.info(f"Densité: {X_tfidf.nnz / (X_tfidf.shape[0] * X_tfidf.shape[1]):.4f}")
+
+    return X_tfidf, feature_names, vectorizer
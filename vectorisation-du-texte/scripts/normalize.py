@@ -7,42 +7,91 @@ Output: Matrice TF-IDF normalisée
 import pandas as pd
 import logging
 from sklearn.preprocessing import normalize
+from sklearn.utils.extmath import row_norms
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
-def normalize_vectors(X_tfidf, norm='l2'):
+def normalize_vectors(X_tfidf, norm='l2', copy=False):
     """
     Normalise les vecteurs TF-IDF à une longueur de 1
     
     Parameters:
     -----------
     X_tfidf : scipy sparse matrix
-        Matrice TF-IDF non normalisée
-    norm : str
-        Type de normalisation ('l2' ou 'l1')
+        Matrice TF-IDF
+    norm : str ou None
+        Type de normalisation ('l2', 'l1' ou None: matrice retournée telle quelle)
+    copy : bool
+        Si False (défaut), normalise en place sans allouer de seconde matrice.
+        apply_tfidf normalise déjà les lignes: l'appel est alors idempotent
     
     Returns:
     --------
     X_normalized : scipy sparse matrix
         Matrice normalisée
     """
+    if not norm:
+        logger.info("Normalisation désactivée (norm=None): matrice inchangée")
+        return X_tfidf
+
     logger.info(f"Normalisation des vecteurs (norme {norm})...")
     
-    X_normalized = normalize(X_tfidf, norm=norm, axis=1)
+    X_normalized = normalize(X_tfidf, norm=norm, axis=1, copy=copy)
     
     logger.info(f"Matrice normalisée: {X_normalized.shape}")
     logger.info(f"Densité: {X_normalized.nnz / (X_normalized.shape[0] * X_normalized.shape[1]):.4f}")
     
-    norms = np.array(X_normalized.multiply(X_normalized).sum(axis=1)).flatten()
-    
-    if norm == 'l2':
-        norms = np.sqrt(norms)
+    norms = _row_norms(X_normalized, norm)
     
-    logger.info(f"Normes L2 - Min: {norms.min():.6f}, Max: {norms.max():.6f}, Moyenne: {norms.mean():.6f}")
+    logger.info(f"Normes {norm.upper()} - Min: {norms.min():.6f}, Max: {norms.max():.6f}, Moyenne: {norms.mean():.6f}")
     logger.info(f"Tous les vecteurs ont norme 1: {np.allclose(norms, 1.0)}")
     
     logger.info(f"Valeurs normalisées - Min: {X_normalized.min():.6f}, Max: {X_normalized.max():.6f}")
     
     return X_normalized
+
+
+def _row_norms(X, norm):
+    if norm == 'l2':
+        return row_norms(X)
+    return np.asarray(abs(X).sum(axis=1)).ravel()
+
+
+def check_normalized(X, norm='l2', n_sample=1000):
+    """
+    Vérifie, sur un échantillon de lignes, que X est déjà normalisée
+
+    Les noyaux de vectorisation (tfidf_inplace, multi-champs, char_wb)
+    normalisent déjà les lignes: seul un échantillon de n_sample lignes
+    régulièrement espacées est contrôlé (lignes vides exclues). Si le
+    contrôle échoue (ex: ancien checkpoint non normalisé), X est normalisée
+    en place.
+
+    Parameters:
+    -----------
+    X : scipy sparse matrix (CSR)
+        Matrice vectorisée
+    norm : str ou None
+        'l2', 'l1' ou None (aucun contrôle)
+    n_sample : int
+        Nombre de lignes contrôlées
+
+    Returns:
+    --------
+    X : scipy sparse matrix
+        La même matrice (normalisée en place si nécessaire)
+    """
+    if not norm or X.shape[0] == 0:
+        return X
+
+    rows = np.unique(np.linspace(0, X.shape[0] - 1, min(n_sample, X.shape[0])).astype(np.intp))
+    norms = _row_norms(X[rows], norm)
+    norms = norms[norms > 0]
+    if np.allclose(norms, 1.0):
+        logger.info(f"Lignes déjà normalisées ({norm}, {len(rows)} lignes contrôlées)")
+        return X
+
+    logger.info(f"Lignes non normalisées ({norm}): normalisation en place")
+    return normalize_vectors(X, norm=norm)
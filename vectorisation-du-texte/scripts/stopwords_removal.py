@@ -4,6 +4,7 @@ Input: Dataframe avec colonne 'texte_lowercased'
 Output: Dataframe avec colonne 'texte_no_stopwords'
 """
 import pandas as pd
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,7 +26,15 @@ def get_stopwords():
         return set(stopwords.words('french'))
 
 
-def remove_stopwords(df, apply_stopwords=True):
+def remove_stopwords_texts(texts, stopwords_fr):
+    """
+    Supprime les stopwords (et les mots d'une lettre) d'une liste de textes
+    """
+    return [' '.join(w for w in text.split() if w not in stopwords_fr and len(w) > 1)
+            for text in texts]
+
+
+def remove_stopwords(df, apply_stopwords=True, cache=None, field='texte'):
     """
     Supprime les mots vides (stopwords) du texte
     
@@ -35,6 +44,10 @@ def remove_stopwords(df, apply_stopwords=True):
         Dataframe avec colonne 'texte_lowercased'
     apply_stopwords : bool
         Si True, supprime les stopwords. Si False, garde le texte original
+    cache : RowCache, optionnel
+        Cache persistant par ligne (seules les lignes manquantes sont traitées)
+    field : str
+        Préfixe des colonnes traitées ('texte', ou 'titre' / 'corps' en multi-champs)
     
     Returns:
     --------
@@ -42,6 +55,7 @@ def remove_stopwords(df, apply_stopwords=True):
         Dataframe avec colonne 'texte_no_stopwords'
     """
     df = df.copy()
+    source, target = f'{field}_lowercased', f'{field}_no_stopwords'
     
     if apply_stopwords:
         logger.info("Suppression des stopwords français...")
@@ -49,24 +63,25 @@ def remove_stopwords(df, apply_stopwords=True):
         stopwords_fr = get_stopwords()
         logger.info(f"Nombre de stopwords chargés: {len(stopwords_fr)}")
         
-        def remove_stop(text):
-            words = text.split()
-            words_filtered = [w for w in words if w not in stopwords_fr and len(w) > 1]
-            return ' '.join(words_filtered)
+        from row_cache import cached_apply
         
-        df['texte_no_stopwords'] = df['texte_lowercased'].apply(remove_stop)
+        params = hashlib.md5(' '.join(sorted(stopwords_fr)).encode('utf-8')).hexdigest()
+        df[target] = cached_apply(
+            cache, "stopwords", params, df[source].tolist(),
+            lambda texts: remove_stopwords_texts(texts, stopwords_fr)
+        )
         logger.info("Stopwords supprimés")
     else:
         logger.info("Suppression des stopwords désactivée, copie du texte original...")
-        df['texte_no_stopwords'] = df['texte_lowercased']
+        df[target] = df[source]
     
     # Statistiques
-    avg_words_before = df['texte_lowercased'].apply(lambda x: len(x.split())).mean()
-    avg_words_after = df['texte_no_stopwords'].apply(lambda x: len(x.split())).mean()
+    avg_words_before = df[source].apply(lambda x: len(x.split())).mean()
+    avg_words_after = df[target].apply(lambda x: len(x.split())).mean()
     
     logger.info(f"Moyenne de mots avant: {avg_words_before:.2f}")
     logger.info(f"Moyenne de mots après: {avg_words_after:.2f}")
-    logger.info(f"Exemple avant: {df['texte_lowercased'].iloc[0][:80]}")
-    logger.info(f"Exemple après: {df['texte_no_stopwords'].iloc[0][:80]}")
+    logger.info(f"Exemple avant: {df[source].iloc[0][:80]}")
+    logger.info(f"Exemple après: {df[target].iloc[0][:80]}")
     
     return df
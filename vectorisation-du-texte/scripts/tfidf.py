@@ -1,19 +1,113 @@
 """
 Script 06 : Pondération TF-IDF (Term Frequency - Inverse Document Frequency)
 Input: Matrice Bag of Words
-Output: Matrice TF-IDF
+Output: Matrice TF-IDF (lignes normalisées)
+
+La pondération (tf sublinéaire, idf) et la normalisation des lignes sont
+appliquées en place sur le tableau `data` de la matrice CSR de comptage:
+aucune copie intermédiaire de la matrice n'est allouée.
 """
 import pandas as pd
 import logging
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
 
 logger = logging.getLogger(__name__)
 
+# Nombre de valeurs non nulles traitées par bloc (borne les temporaires idf[indices])
+KERNEL_CHUNK_SIZE = 1 << 20
+
+
+def compute_idf(X, n_docs=None):
+    """
+    IDF lissé (identique à TfidfTransformer(smooth_idf=True))
+    """
+    n_docs = X.shape[0] if n_docs is None else n_docs
+    doc_freq = np.bincount(X.indices, minlength=X.shape[1])
+    return np.log((1 + n_docs) / (1 + doc_freq)) + 1
+
+
+def tfidf_inplace(X, idf, sublinear_tf=True, norm='l2'):
+    """
+    Noyau fusionné: tf sublinéaire, pondération idf et normalisation des
+    lignes, directement sur X.data (CSR float64)
+
+    Parameters:
+    -----------
+    X : scipy sparse matrix (CSR, float)
+        Matrice de comptage, modifiée en place
+    idf : numpy array
+        Poids idf par colonne
+    sublinear_tf : bool
+        Remplacer tf par 1 + log(tf)
+    norm : str ou None
+        'l2', 'l1' ou None
+
+    Returns:
+    --------
+    X : scipy sparse matrix
+        La même matrice, pondérée et normalisée
+    """
+    data, indices = X.data, X.indices
+    for start in range(0, len(data), KERNEL_CHUNK_SIZE):
+        chunk = data[start:start + KERNEL_CHUNK_SIZE]
+        if sublinear_tf:
+            np.log(chunk, out=chunk)
+            chunk += 1
+        chunk *= idf[indices[start:start + KERNEL_CHUNK_SIZE]]
+
+    if norm:
+        # normalize(copy=False) normalise les lignes CSR en place
+        normalize(X, norm=norm, copy=False)
+    return X
+
+
+def build_vectorizer(count_vectorizer, idf, sublinear_tf=True, norm='l2'):
+    """
+    Construit un TfidfVectorizer ajusté (vocabulaire + idf) pour le transform
+    de nouveaux textes, sans réanalyser le corpus
+
+    Le vocabulaire appris est repris tel quel dans vocabulary_ (même dict,
+    pas de paramètre `vocabulary`): passé au constructeur, il serait recopié
+    par le setter de idf_ et stocké deux fois dans chaque pickle.
+    """
+    tfidf_vectorizer = TfidfVectorizer(sublinear_tf=sublinear_tf, norm=norm,
+                                       **count_vectorizer.get_params())
+    tfidf_vectorizer.vocabulary_ = count_vectorizer.vocabulary_
+    tfidf_vectorizer.idf_ = idf
+    return tfidf_vectorizer
+
 
-def apply_tfidf(df, ngram_range=(1, 1), min_df=2, max_df=0.8):
+def fit_tfidf(texts, ngram_range=(1, 1), min_df=2, max_df=0.8, sublinear_tf=True,
+              analyzer='word', token_pattern=r'\b\w+\b', norm='l2'):
+    """
+    Ajuste le vocabulaire et l'idf sur `texts` et retourne la matrice TF-IDF
+    (noyau fusionné en place) et le vectoriseur ajusté
+    """
+    count_vectorizer = CountVectorizer(
+        ngram_range=ngram_range,
+        min_df=min_df,
+        max_df=max_df,
+        lowercase=False,
+        analyzer=analyzer,
+        token_pattern=token_pattern,
+        dtype=np.float64
+    )
+
+    X_tfidf = count_vectorizer.fit_transform(texts)
+    idf = compute_idf(X_tfidf)
+    tfidf_inplace(X_tfidf, idf, sublinear_tf=sublinear_tf, norm=norm)
+
+    tfidf_vectorizer = build_vectorizer(count_vectorizer, idf, sublinear_tf=sublinear_tf, norm=norm)
+    return X_tfidf, tfidf_vectorizer
+
+
+def apply_tfidf(df, ngram_range=(1, 1), min_df=2, max_df=0.8, sublinear_tf=True,
+                analyzer='word', token_pattern=r'\b\w+\b', norm='l2'):
     """
     Applique la pondération TF-IDF au texte
-    
+
     Parameters:
     -----------
     df : DataFrame
@@ -24,43 +118,51 @@ def apply_tfidf(df, ngram_range=(1, 1), min_df=2, max_df=0.8):
         Fréquence minimale d'un terme
     max_df : float
         Ratio maximal de documents
-    
+    sublinear_tf : bool
+        Remplacer tf par 1 + log(tf)
+    analyzer : str
+        'word', 'char' ou 'char_wb'
+    token_pattern : str
+        Expression régulière des tokens (analyzer='word')
+    norm : str ou None
+        Normalisation des lignes ('l2', 'l1' ou None)
+
     Returns:
     --------
     X_tfidf : scipy sparse matrix
-        Matrice TF-IDF
+        Matrice TF-IDF (lignes normalisées)
     feature_names : list
         Noms des n-grammes
     tfidf_vectorizer : TfidfVectorizer
         L'objet vectoriseur
     """
     logger.info(f"Application de TF-IDF avec n-grammes {ngram_range}...")
-    
-    tfidf_vectorizer = TfidfVectorizer(
+
+    X_tfidf, tfidf_vectorizer = fit_tfidf(
+        df['texte_lemmatized'],
         ngram_range=ngram_range,
         min_df=min_df,
         max_df=max_df,
-        lowercase=False,
-        token_pattern=r'\b\w+\b',
-        sublinear_tf=True
+        sublinear_tf=sublinear_tf,
+        analyzer=analyzer,
+        token_pattern=token_pattern,
+        norm=norm
     )
-    
-    X_tfidf = tfidf_vectorizer.fit_transform(df['texte_lemmatized'])
     feature_names = tfidf_vectorizer.get_feature_names_out().tolist()
-    
+
     logger.info(f"Vocabulaire TF-IDF créé: {len(feature_names)} n-grammes uniques")
     logger.info(f"Matrice TF-IDF: {X_tfidf.shape}")
     logger.info(f"Densité: {X_tfidf.nnz / (X_tfidf.shape[0] * X_tfidf.shape[1]):.4f}")
-    
+
     mean_tfidf = X_tfidf.mean()
     max_tfidf = X_tfidf.max()
-    
+
     logger.info(f"Valeurs TF-IDF - Min: 0.0, Max: {max_tfidf:.4f}, Moyenne: {mean_tfidf:.4f}")
-    
+
     tfidf_scores = X_tfidf.mean(axis=0).A1
     top_indices = tfidf_scores.argsort()[-10:][::-1]
     logger.info("Top 10 n-grammes par score TF-IDF moyen:")
     for idx in top_indices:
         logger.info(f"  - {feature_names[idx]}: {tfidf_scores[idx]:.4f}")
-    
+
     return X_tfidf, feature_names, tfidf_vectorizer
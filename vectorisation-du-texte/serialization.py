@@ -0,0 +1,187 @@
+"""
+Sérialisation des checkpoints et des résultats FINAL
+
+Format: pickle protocole 5 avec buffers hors-bande. Les tableaux numpy /
+scipy (data, indices, indptr des matrices creuses...) ne sont pas copiés
+dans le flux pickle: ils sont écrits directement depuis leur mémoire
+(zéro copie sans compression) ou compressés buffer par buffer.
+
+Codecs: "none", "zlib-<niveau>", "lzma-<niveau>" (bibliothèque standard),
+"lz4" et "zstd-<niveau>" si lz4 / zstandard sont installés, et "fast" qui
+compresse sans ralentir sensiblement l'écriture (lz4, sinon "none"). zstd
+(meilleur ratio, écriture ~10x plus lente que "none") n'est utilisé que
+demandé explicitement.
+
+Les fichiers pickle classiques (anciens résultats) restent lisibles par load().
+"""
+import logging
+import pickle
+import struct
+import zlib
+import lzma
+
+from config import ARTIFACT_CODECS
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"VTXPKL5\x00"
+_LENGTH = struct.Struct("<Q")
+
+
+def _zstd():
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+def _lz4():
+    try:
+        import lz4.frame
+        return lz4.frame
+    except ImportError:
+        return None
+
+
+def available_codecs():
+    """
+    Liste les codecs utilisables dans l'environnement courant
+    """
+    codecs = ["none", "zlib-1", "zlib-6", "lzma-0", "lzma-6"]
+    if _lz4() is not None:
+        codecs.append("lz4")
+    if _zstd() is not None:
+        codecs += ["zstd-1", "zstd-3", "zstd-9"]
+    return codecs
+
+
+def resolve_codec(codec):
+    """
+    Résout "fast" vers le codec rapide disponible et valide le nom
+    """
+    if codec == "fast":
+        # zlib-1 / zstd écrivent 3 à 10 fois moins vite que "none": pas de repli sur eux
+        return "lz4" if _lz4() is not None else "none"
+
+    name = codec.partition("-")[0]
+    if name not in ("none", "zlib", "lzma", "lz4", "zstd"):
+        raise ValueError(f"Codec inconnu: {codec}")
+    if name == "zstd" and _zstd() is None:
+        raise ImportError("zstandard est requis pour le codec zstd (pip install zstandard)")
+    if name == "lz4" and _lz4() is None:
+        raise ImportError("lz4 est requis pour le codec lz4 (pip install lz4)")
+    return codec
+
+
+def _compressor(codec):
+    name, _, level = codec.partition("-")
+    if name == "none":
+        return None
+    if name == "zlib":
+        level = int(level or 6)
+        return lambda data: zlib.compress(data, level)
+    if name == "lzma":
+        level = int(level or 6)
+        return lambda data: lzma.compress(data, preset=level)
+    if name == "lz4":
+        return _lz4().compress
+    if name == "zstd":
+        return _zstd().ZstdCompressor(level=int(level or 3)).compress
+
+
+def _decompressor(codec):
+    name = codec.partition("-")[0]
+    if name == "none":
+        return None
+    if name == "zlib":
+        return zlib.decompress
+    if name == "lzma":
+        return lzma.decompress
+    if name == "lz4":
+        return _lz4().decompress
+    if name == "zstd":
+        return _zstd().ZstdDecompressor().decompress
+
+
+def _write_block(f, data, compress):
+    """Écrit un bloc [longueur brute][longueur stockée][octets]"""
+    raw_length = memoryview(data).nbytes
+    if compress is not None:
+        data = compress(data)
+    f.write(_LENGTH.pack(raw_length))
+    f.write(_LENGTH.pack(memoryview(data).nbytes))
+    f.write(data)
+
+
+def _read_block(f, decompress):
+    raw_length, = _LENGTH.unpack(f.read(_LENGTH.size))
+    stored_length, = _LENGTH.unpack(f.read(_LENGTH.size))
+    if decompress is None:
+        buffer = bytearray(raw_length)
+        f.readinto(buffer)
+        return buffer
+    # bytearray: les tableaux reconstruits restent modifiables en place
+    return bytearray(decompress(f.read(stored_length)))
+
+
+def dump(obj, filepath, codec="none"):
+    """
+    Sérialise `obj` dans `filepath` (protocole 5, buffers hors-bande)
+
+    Parameters:
+    -----------
+    obj : object
+        Objet à sauvegarder
+    filepath : str ou Path
+        Fichier de sortie
+    codec : str
+        Codec de compression (cf. available_codecs, ou "fast")
+
+    Returns:
+    --------
+    codec : str
+        Le codec effectivement utilisé
+    """
+    codec = resolve_codec(codec)
+    compress = _compressor(codec)
+
+    buffers = []
+    stream = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+
+    with open(filepath, 'wb') as f:
+        f.write(MAGIC)
+        name = codec.encode('ascii')
+        f.write(bytes([len(name)]) + name)
+        f.write(_LENGTH.pack(len(buffers)))
+        _write_block(f, stream, compress)
+        for buffer in buffers:
+            # raw() expose la mémoire du tableau sans la copier
+            _write_block(f, buffer.raw(), compress)
+    return codec
+
+
+def load(filepath):
+    """
+    Charge un objet écrit par dump() ou un fichier pickle classique
+    """
+    with open(filepath, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            f.seek(0)
+            return pickle.load(f)
+
+        name_length = f.read(1)[0]
+        codec = f.read(name_length).decode('ascii')
+        n_buffers, = _LENGTH.unpack(f.read(_LENGTH.size))
+        decompress = _decompressor(codec)
+
+        stream = _read_block(f, decompress)
+        buffers = [_read_block(f, decompress) for _ in range(n_buffers)]
+    return pickle.loads(stream, buffers=buffers)
+
+
+def artifact_codec(artifact):
+    """
+    Codec configuré pour un type d'artefact ('checkpoint', 'final', ...)
+    """
+    return ARTIFACT_CODECS.get(artifact, "none")
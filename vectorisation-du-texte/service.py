@@ -0,0 +1,274 @@
+"""
+Service de scoring en ligne (asyncio, HTTP sur TCP ou socket Unix)
+
+Charge une fois au démarrage les artefacts d'une configuration FINAL (cf.
+inference.py) puis regroupe les requêtes concurrentes en micro-lots: un lot
+part dès qu'il atteint --max-batch-size avis ou que le plus ancien avis a
+attendu --max-latency-ms. Chaque lot passe une seule fois par nlp.pipe et
+par le transform creux, dans un thread dédié pour ne pas bloquer la boucle.
+
+Protocole (HTTP/1.1, connexions keep-alive):
+    POST /score   {"titre": "...", "corps": "..."}  (ou {"texte": "..."})
+              ->  {"avis": "positif", "probas": {...}, "n_terms": 12}
+    GET  /health  ->  configuration chargée et statistiques des lots
+
+Usage:
+    python service.py --config config_L1_S1_LEM1_NG2
+    python service.py --config NAME --unix /tmp/vectorisation.sock
+    python service.py --config NAME --max-batch-size 128 --max-latency-ms 5
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import SERVICE_HOST, SERVICE_PORT, SERVICE_MAX_BATCH_SIZE, SERVICE_MAX_LATENCY_MS
+from utils import setup_logging
+
+logger = logging.getLogger(__name__)
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+class MicroBatcher:
+    """
+    Regroupe les appels concurrents à submit() en lots traités par `process`
+
+    Parameters:
+    -----------
+    process : callable
+        Fonction synchrone liste d'entrées -> liste de résultats (même ordre)
+    max_batch_size : int
+        Taille maximale d'un lot
+    max_latency : float
+        Attente maximale (secondes) entre l'arrivée du premier élément d'un
+        lot et son traitement
+    """
+
+    def __init__(self, process, max_batch_size=SERVICE_MAX_BATCH_SIZE,
+                 max_latency=SERVICE_MAX_LATENCY_MS / 1000):
+        self.process = process
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.n_batches = 0
+        self.n_items = 0
+        self._queue = asyncio.Queue()
+        # Un seul thread: les lots sont traités l'un après l'autre, spaCy et
+        # le vectoriseur ne sont jamais appelés en concurrence
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, item):
+        """
+        Ajoute un élément au prochain lot et attend son résultat
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        """Attend un premier élément puis remplit le lot jusqu'à la taille ou l'échéance"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_latency
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, self.process, items)
+            except Exception as e:
+                logger.exception(e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.n_batches += 1
+            self.n_items += len(batch)
+            for (_, future), result in zip(batch, results):
+                # Client déconnecté entre-temps: le future a pu être annulé
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self):
+        return {
+            'batches': self.n_batches,
+            'items': self.n_items,
+            'mean_batch_size': round(self.n_items / self.n_batches, 2) if self.n_batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'max_latency_ms': self.max_latency * 1000
+        }
+
+
+async def read_request(reader):
+    """
+    Lit une requête HTTP/1.1 (ligne de requête, en-têtes, corps Content-Length)
+
+    Returns:
+    --------
+    (méthode, chemin, en-têtes, corps) ou None si la connexion est fermée
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, path, _ = request_line.decode('latin-1').split(' ', 2)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get('content-length', 0))
+    body = await reader.readexactly(length) if length else b''
+    return method, path, headers, body
+
+
+def write_response(writer, status, payload, keep_alive=True):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + body)
+
+
+class ScoringService:
+    """
+    Serveur HTTP asyncio devant un MicroBatcher sur FittedConfig.score
+    """
+
+    def __init__(self, fitted, max_batch_size=SERVICE_MAX_BATCH_SIZE,
+                 max_latency_ms=SERVICE_MAX_LATENCY_MS):
+        self.fitted = fitted
+        self.max_batch_size = max_batch_size
+        self.max_latency_ms = max_latency_ms
+        self.batcher = None
+
+    async def handle(self, method, path, body):
+        """
+        Retourne (statut, réponse JSON) pour une requête
+        """
+        if method == 'GET' and path == '/health':
+            return 200, {'config': self.fitted.name, 'n_features': self.fitted.n_features,
+                         **self.batcher.stats()}
+        if method == 'POST' and path == '/score':
+            try:
+                record = json.loads(body)
+            except ValueError:
+                return 400, {'error': "Corps JSON invalide"}
+            if not isinstance(record, dict):
+                return 400, {'error': "Un avis par requête: objet {titre, corps} ou {texte}"}
+            return 200, await self.batcher.submit(record)
+        return 404, {'error': f"Route inconnue: {method} {path}"}
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                try:
+                    status, payload = await self.handle(method, path, body)
+                except Exception as e:
+                    status, payload = 500, {'error': str(e)}
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=SERVICE_HOST, port=SERVICE_PORT, unix_path=None):
+        self.batcher = MicroBatcher(self.fitted.score, self.max_batch_size,
+                                    self.max_latency_ms / 1000)
+        self.batcher.start()
+        if unix_path:
+            Path(unix_path).unlink(missing_ok=True)
+            server = await asyncio.start_unix_server(self.serve_connection, path=unix_path)
+            logger.info(f"Service de scoring à l'écoute sur {unix_path}")
+        else:
+            server = await asyncio.start_server(self.serve_connection, host, port)
+            logger.info(f"Service de scoring à l'écoute sur http://{host}:{port}")
+        logger.info(f"Micro-lots: {self.max_batch_size} avis max, "
+                    f"{self.max_latency_ms} ms d'attente max")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Service de scoring en ligne d'une configuration")
+    parser.add_argument("--config", required=True, metavar="NAME",
+                        help="Configuration dont le résultat FINAL est chargé")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--unix", metavar="CHEMIN",
+                        help="Écouter sur un socket Unix plutôt qu'en TCP")
+    parser.add_argument("--max-batch-size", type=int, default=SERVICE_MAX_BATCH_SIZE,
+                        help="Avis par micro-lot au maximum")
+    parser.add_argument("--max-latency-ms", type=float, default=SERVICE_MAX_LATENCY_MS,
+                        help="Attente maximale avant de traiter un lot incomplet")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging(to_file=False)
+
+    from inference import FittedConfig
+
+    fitted = FittedConfig.load(args.config)
+    fitted.warmup()
+
+    service = ScoringService(fitted, args.max_batch_size, args.max_latency_ms)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        logger.info("Service arrêté")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
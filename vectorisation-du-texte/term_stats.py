@@ -0,0 +1,311 @@
+"""
+Statistiques des termes par classe sur les résultats FINAL
+
+Pour une configuration, les agrégats par classe de `avis` sont calculés en
+une passe par deux produits creux avec la matrice indicatrice des classes
+Y (n_classes × n_docs, un 1 par avis):
+- doc_freq = Y @ B : nombre d'avis de chaque classe contenant le terme
+  (B = structure binaire de X_normalized, qui partage indices / indptr);
+- weight   = Y @ X : masse TF-IDF du terme dans chaque classe.
+
+Les log-odds (classe contre le reste) suivent Monroe et al. (2008), prior de
+Dirichlet informatif proportionnel aux fréquences du corpus, calculés sur les
+fréquences documentaires (un avis compte une fois par terme) et rapportés en
+z-scores. Aucune tranche de la matrice n'est densifiée: seuls les tableaux
+n_classes × n_features le sont.
+
+Les statistiques sont mises en cache par configuration (en mémoire et dans
+output/<config>_FINAL_terms.pkl, invalidé si le FINAL change): les requêtes
+top-k et les comparaisons entre configurations ne relisent pas le FINAL.
+
+Usage:
+    python term_stats.py --config config_L1_S1_LEM1_NG3 --label négatif -k 20
+    python term_stats.py --config NAME_A --config NAME_B --label positif
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import OUTPUT_DIR, TERM_STATS_PRIOR_SIZE, TERM_STATS_TOP_K
+
+logger = logging.getLogger(__name__)
+
+# Colonnes triables par top_terms()
+SORT_KEYS = ("log_odds", "doc_freq", "doc_rate", "weight")
+
+_CACHE = {}
+
+
+def get_stats_file(config_name):
+    """
+    Retourne le chemin du cache des statistiques d'une configuration
+    """
+    return OUTPUT_DIR / f"{config_name}_FINAL_terms.pkl"
+
+
+def _final_signature(config_name):
+    stat = (OUTPUT_DIR / f"{config_name}_FINAL.pkl").stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+class TermStats:
+    """
+    Agrégats par classe des termes d'une configuration
+
+    Parameters:
+    -----------
+    classes : numpy array
+        Étiquettes des classes (ordre des lignes des tableaux)
+    terms : numpy array of str
+        Noms des colonnes de la matrice (feature_names)
+    n_docs : numpy array
+        Nombre d'avis par classe
+    doc_freq : numpy array (n_classes × n_features, int64)
+        Nombre d'avis de chaque classe contenant le terme
+    weight : numpy array (n_classes × n_features, float64)
+        Somme des poids TF-IDF normalisés du terme par classe
+    prior_size : float
+        Masse totale α0 du prior de Dirichlet des log-odds
+    """
+
+    def __init__(self, classes, terms, n_docs, doc_freq, weight,
+                 prior_size=TERM_STATS_PRIOR_SIZE, config_name=None):
+        self.classes = np.asarray(classes)
+        self.terms = np.asarray(terms, dtype=str)
+        self.n_docs = np.asarray(n_docs)
+        self.doc_freq = doc_freq
+        self.weight = weight
+        self.prior_size = prior_size
+        self.config_name = config_name
+        self._log_odds = None
+        self._index = None
+
+    @classmethod
+    def from_matrix(cls, X, target, terms, **kwargs):
+        """
+        Calcule les agrégats par classe par produits creux indicatrice × X
+        """
+        from scipy import sparse
+
+        X = sparse.csr_matrix(X)
+        classes, codes = np.unique(np.asarray(target), return_inverse=True)
+        n_samples = X.shape[0]
+        Y = sparse.csr_matrix(
+            (np.ones(n_samples), (codes, np.arange(n_samples))),
+            shape=(len(classes), n_samples)
+        )
+        # Structure binaire de X: nouveau tableau data, indices / indptr partagés
+        B = sparse.csr_matrix((np.ones(X.nnz), X.indices, X.indptr), shape=X.shape)
+
+        doc_freq = (Y @ B).toarray().astype(np.int64)
+        weight = (Y @ X).toarray()
+        n_docs = np.bincount(codes, minlength=len(classes))
+        return cls(classes, terms, n_docs, doc_freq, weight, **kwargs)
+
+    @classmethod
+    def from_final(cls, final, **kwargs):
+        """
+        Statistiques d'un résultat FINAL (cf. utils.load_final)
+        """
+        return cls.from_matrix(final['X_normalized'], final['target'], final['feature_names'],
+                               config_name=final['config']['name'], **kwargs)
+
+    @classmethod
+    def load(cls, config_name):
+        """
+        Statistiques de `config_name`, depuis le cache si le FINAL n'a pas changé
+        """
+        import serialization
+        from utils import load_final
+
+        signature = _final_signature(config_name)
+        cached = _CACHE.get(config_name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        stats_file = get_stats_file(config_name)
+        stats = None
+        if stats_file.exists():
+            saved = serialization.load(stats_file)
+            if saved['signature'] == signature and saved['prior_size'] == TERM_STATS_PRIOR_SIZE:
+                stats = cls(config_name=config_name, **{
+                    key: value for key, value in saved.items() if key != 'signature'})
+
+        if stats is None:
+            start = time.perf_counter()
+            stats = cls.from_final(load_final(config_name))
+            logger.info(f"Statistiques des termes de {config_name} calculées en "
+                        f"{time.perf_counter() - start:.2f}s")
+            serialization.dump({
+                'signature': signature,
+                'classes': stats.classes,
+                'terms': stats.terms,
+                'n_docs': stats.n_docs,
+                'doc_freq': stats.doc_freq,
+                'weight': stats.weight,
+                'prior_size': stats.prior_size
+            }, stats_file, codec=serialization.artifact_codec("final"))
+
+        _CACHE[config_name] = (signature, stats)
+        return stats
+
+    def class_index(self, label):
+        matches = np.flatnonzero(self.classes.astype(str) == str(label))
+        if not len(matches):
+            raise ValueError(f"Classe inconnue: {label!r} (classes: {list(self.classes)})")
+        return matches[0]
+
+    @property
+    def log_odds(self):
+        """
+        z-scores des log-odds de chaque classe contre le reste (n_classes × n_features)
+        """
+        if self._log_odds is None:
+            total = self.doc_freq.sum(axis=0)
+            alpha = self.prior_size * total / max(total.sum(), 1)
+            alpha0 = alpha.sum()
+            in_class = self.doc_freq + alpha
+            rest = (total - self.doc_freq) + alpha
+            n_in = self.doc_freq.sum(axis=1, keepdims=True) + alpha0
+            n_rest = total.sum() - self.doc_freq.sum(axis=1, keepdims=True) + alpha0
+            with np.errstate(divide='ignore', invalid='ignore'):
+                delta = (np.log(in_class / (n_in - in_class))
+                         - np.log(rest / (n_rest - rest)))
+                z = delta / np.sqrt(1 / in_class + 1 / rest)
+            self._log_odds = np.nan_to_num(z)
+        return self._log_odds
+
+    def _column(self, key, row):
+        if key == "log_odds":
+            return self.log_odds[row]
+        if key == "doc_freq":
+            return self.doc_freq[row]
+        if key == "doc_rate":
+            return self.doc_freq[row] / max(self.n_docs[row], 1)
+        if key == "weight":
+            return self.weight[row]
+        raise ValueError(f"Critère inconnu: {key!r} ({', '.join(SORT_KEYS)})")
+
+    def _table(self, row, columns):
+        import pandas as pd
+
+        return pd.DataFrame({
+            'term': self.terms[columns],
+            'doc_freq': self.doc_freq[row, columns],
+            'doc_rate': self.doc_freq[row, columns] / max(self.n_docs[row], 1),
+            'weight': self.weight[row, columns],
+            'log_odds': self.log_odds[row, columns]
+        })
+
+    def top_terms(self, label, k=TERM_STATS_TOP_K, by="log_odds"):
+        """
+        Les k termes les plus caractéristiques d'une classe
+
+        Parameters:
+        -----------
+        label : str
+            Classe de `avis` (ex: 'positif')
+        k : int
+            Nombre de termes
+        by : str
+            'log_odds' (discriminant, défaut), 'doc_freq', 'doc_rate' ou 'weight'
+
+        Returns:
+        --------
+        DataFrame trié par `by` décroissant (term, doc_freq, doc_rate, weight, log_odds)
+        """
+        row = self.class_index(label)
+        values = self._column(by, row)
+        k = min(k, len(values))
+        if k <= 0:
+            return self._table(row, np.array([], dtype=np.intp))
+        # Sélection O(n_features) puis tri des k seulement
+        top = np.argpartition(-values, k - 1)[:k]
+        top = top[np.argsort(-values[top], kind='stable')]
+        return self._table(row, top)
+
+    def lookup(self, terms, label):
+        """
+        Statistiques de termes donnés pour une classe (NaN si absents du vocabulaire)
+        """
+        import pandas as pd
+
+        if self._index is None:
+            self._index = pd.Index(self.terms)
+        positions = self._index.get_indexer(list(terms))
+        table = self._table(self.class_index(label), np.maximum(positions, 0))
+        table['term'] = list(terms)
+        table.loc[positions < 0, ['doc_freq', 'doc_rate', 'weight', 'log_odds']] = np.nan
+        return table
+
+
+def get_term_stats(config_name):
+    """
+    Statistiques des termes d'une configuration (cache mémoire puis disque)
+    """
+    return TermStats.load(config_name)
+
+
+def compare(config_names, label, k=TERM_STATS_TOP_K, by="log_odds"):
+    """
+    Compare les termes caractéristiques d'une classe entre configurations
+
+    Returns:
+    --------
+    DataFrame indexé par l'union des top-k de chaque configuration, une
+    colonne par configuration (valeur de `by`, NaN si le terme est absent
+    du vocabulaire), trié par la moyenne décroissante
+    """
+    import pandas as pd
+
+    all_stats = {name: get_term_stats(name) for name in config_names}
+    terms = list(dict.fromkeys(
+        term for stats in all_stats.values() for term in stats.top_terms(label, k, by)['term']))
+    table = pd.DataFrame(
+        {name: stats.lookup(terms, label)[by].to_numpy() for name, stats in all_stats.items()},
+        index=pd.Index(terms, name='term')
+    )
+    return table.loc[table.mean(axis=1).sort_values(ascending=False).index]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Termes caractéristiques de chaque classe")
+    parser.add_argument("--config", action="append", required=True, metavar="NAME",
+                        help="Configuration (répétable: comparaison entre configurations)")
+    parser.add_argument("--label", help="Classe de avis (défaut: toutes)")
+    parser.add_argument("-k", type=int, default=TERM_STATS_TOP_K, help="Nombre de termes")
+    parser.add_argument("--by", choices=SORT_KEYS, default="log_odds",
+                        help="Critère de tri (défaut: log_odds)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import pandas as pd
+    from utils import setup_logging
+
+    args = parse_args(argv)
+    setup_logging(to_file=False)
+
+    stats = get_term_stats(args.config[0])
+    labels = [args.label] if args.label else [str(label) for label in stats.classes]
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        for label in labels:
+            start = time.perf_counter()
+            if len(args.config) > 1:
+                table = compare(args.config, label, args.k, args.by)
+            else:
+                table = stats.top_terms(label, args.k, args.by)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"\n== {label} ({args.by}, {elapsed:.1f} ms) ==")
+            print(table.to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,35 @@
 """
 Utilitaires pour la pipeline de vectorisation
 """
-import json
 import logging
 from pathlib import Path
-from config import LOG_FILE, OUTPUT_DIR
+from config import LOG_FILE, OUTPUT_DIR, ensure_output_dir
+import serialization
+from registry import get_registry
 import os
 
-# Configuration du logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
 
+def setup_logging(to_file=True):
+    """
+    Configure le logging (console + fichier output/pipeline.log)
+
+    À appeler explicitement depuis les points d'entrée: importer utils
+    ne crée plus de fichier de log ni de répertoire.
+    """
+    handlers = [logging.StreamHandler()]
+    if to_file:
+        ensure_output_dir()
+        handlers.append(logging.FileHandler(LOG_FILE))
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=handlers
+    )
+
+
 def get_checkpoint_file(config_name):
     """
     Retourne le chemin du fichier de checkpoint pour une configuration donnée
@@ -46,13 +56,12 @@ def get_config_name(lowercase, stopwords, lemmatization, ngram):
 
 def save_checkpoint(data, config_name, step_name):
     """
-    Sauvegarde un checkpoint des données
+    Sauvegarde un checkpoint des données (cf. serialization.py)
     """
-    filepath = OUTPUT_DIR / f"{config_name}_{step_name}.pkl"
-    import pickle
-    with open(filepath, 'wb') as f:
-        pickle.dump(data, f)
-    logger.info(f"Checkpoint sauvegardé: {filepath}")
+    filepath = ensure_output_dir() / f"{config_name}_{step_name}.pkl"
+    codec = serialization.dump(data, filepath, codec=serialization.artifact_codec("checkpoint"))
+    logger.info(f"Checkpoint sauvegardé: {filepath} ({codec})")
+    return filepath
 
 
 def load_checkpoint(config_name, step_name):
@@ -61,62 +70,46 @@ def load_checkpoint(config_name, step_name):
     """
     filepath = OUTPUT_DIR / f"{config_name}_{step_name}.pkl"
     if filepath.exists():
-        import pickle
-        with open(filepath, 'rb') as f:
-            logger.info(f"Checkpoint chargé: {filepath}")
-            return pickle.load(f)
+        logger.info(f"Checkpoint chargé: {filepath}")
+        return serialization.load(filepath)
     return None
 
 
+def save_final(data, config_name):
+    """
+    Sauvegarde le résultat final d'une configuration
+    """
+    filepath = ensure_output_dir() / f"{config_name}_FINAL.pkl"
+    serialization.dump(data, filepath, codec=serialization.artifact_codec("final"))
+    return filepath
+
+
+def load_final(config_name):
+    """
+    Charge le résultat final d'une configuration (nouveau format ou pickle classique)
+    """
+    return serialization.load(OUTPUT_DIR / f"{config_name}_FINAL.pkl")
+
+
 def get_config_status():
     """
     Retourne le statut de traitement de toutes les configurations
+
+    {configuration: [étapes enregistrées]} lu dans le registre (registry.py),
+    sans lister les fichiers de output/
     """
-    status = {}
-    for file in OUTPUT_DIR.glob("config_*.pkl"):
-        parts = file.stem.replace("config_", "").split("_")
-        config_key = f"{parts[0]}_{parts[1]}_{parts[2]}_{parts[3]}"
-        step = parts[-1] if len(parts) > 4 else "unknown"
-        
-        if config_key not in status:
-            status[config_key] = {"completed_steps": []}
-        status[config_key]["completed_steps"].append(step)
-    
-    return status
+    return get_registry().stages()
 
 
-def log_config_complete(config_name, final_output_file):
+def log_config_complete(config_name, final_output_file, duration=None):
     """
     Log qu'une configuration est terminée
     """
-    status_file = OUTPUT_DIR / "status.json"
-    
-    status = {}
-    if status_file.exists():
-        with open(status_file, 'r') as f:
-            status = json.load(f)
-    
-    status[config_name] = {
-        "completed": True,
-        "output_file": str(final_output_file)
-    }
-    
-    with open(status_file, 'w') as f:
-        json.dump(status, f, indent=2)
+    get_registry().finish_run(config_name, duration, final_output_file)
 
 
 def get_completed_configs():
     """
     Retourne la liste des configurations complètement traitées
     """
-    status_file = OUTPUT_DIR / "status.json"
-    if not status_file.exists():
-        return set()
-    
-    with open(status_file, 'r') as f:
-        status = json.load(f)
-    
-    return {k for k, v in status.items() if v.get("completed", False)}
-
-
-logger.info("Utilitaires chargés avec succès")
+    return get_registry().completed()